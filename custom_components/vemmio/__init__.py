@@ -11,7 +11,8 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN, LOGGER
-from .coordinator import VemmioDataUpdateCoordinator
+from .coordinator import VemmioDataUpdateCoordinator, snapshot_store
+from .debug import DeviceSummary
 
 PLATFORMS: Final = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.SWITCH]
 
@@ -26,22 +27,44 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: VemmioConfigEntry) -> bool:
     """Set up Vemmio from a config entry."""
-    entry.runtime_data = VemmioDataUpdateCoordinator(hass, entry=entry)
-    LOGGER.debug("[async_setup_entry] Entry data: %s", str(entry.data))
+    coordinator = entry.runtime_data = VemmioDataUpdateCoordinator(hass, entry=entry)
+    LOGGER.debug("[async_setup_entry] Entry data: %s", entry.data)
     LOGGER.debug(
         "[async_setup_entry] Setting up Vemmio for host %s", entry.data["host"]
     )
-    LOGGER.debug(
-        "[async_setup_entry] Coordinator data: %s", str(entry.runtime_data.data)
-    )
 
-    await entry.runtime_data.async_config_entry_first_refresh()
+    # Entities are created from the last known snapshot when there is one,
+    # so a slow or unreachable device does not hold up the setup.
+    if not await coordinator.async_restore_snapshot():
+        await coordinator.async_config_entry_first_refresh()
+        LOGGER.debug(
+            "[async_setup_entry] Coordinator data: %s",
+            DeviceSummary(coordinator.data),
+        )
 
     # Set up all platforms for this device/entry.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if coordinator.scheduler is not None:
+        coordinator.async_schedule_staggered_refresh()
+    elif coordinator.data is None:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"vemmio refresh {entry.entry_id}"
+        )
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: VemmioConfigEntry) -> None:
+    """Remove the stored device snapshot of a deleted config entry."""
+    await snapshot_store(hass, entry).async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: VemmioConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: VemmioConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
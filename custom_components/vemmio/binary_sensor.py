@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from vemmio import Capability
+from typing import Final
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -14,7 +14,8 @@ from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from . import VemmioConfigEntry
 from .const import LOGGER
 from .coordinator import VemmioDataUpdateCoordinator
-from .entity import VemmioEntity, async_setup_attribute_entities_by_capability
+from .entity import VemmioEntity, async_setup_entities
+from .models import VemmioCapability
 
 
 async def async_setup_entry(
@@ -23,46 +24,24 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up Vemmio switches based on a config entry."""
-    coordinator = entry.runtime_data
     LOGGER.debug("Setting up Vemmio binary sensor for host %s", entry.data["host"])
 
-    async_setup_attribute_entities_by_capability(
-        hass, entry, async_add_entities, coordinator, VemmioBinarySensor, "openClose"
-    )
-
-    async_setup_attribute_entities_by_capability(
-        hass,
-        entry,
-        async_add_entities,
-        coordinator,
-        VemmioMotionSensor,
-        "motionDetector",
-    )
-
-    async_setup_attribute_entities_by_capability(
-        hass,
-        entry,
-        async_add_entities,
-        coordinator,
-        VemmioFloodBinarySensor,
-        "floodDetector",
-    )
+    async_setup_entities(entry, async_add_entities, BINARY_SENSOR_TYPES)
 
 
 class VemmioBinarySensor(VemmioEntity, BinarySensorEntity):
     """Defines a Vemmio binary sensor."""
 
+    _attr_device_class = BinarySensorDeviceClass.DOOR
+
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
-
-        self._attr_device_class = BinarySensorDeviceClass.DOOR
         LOGGER.debug("Initializing Vemmio binary sensor")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -70,42 +49,27 @@ class VemmioBinarySensor(VemmioEntity, BinarySensorEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"binary_sensor_{capability.get_uuid_with_id()}"
-        self._capability = capability
-        self._coordinator = coordinator
 
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        return self.coordinator.data.get_input_state(
-            self._capability.node_uuid, self._capability.id
-        )
-
-    async def async_update(self) -> None:
-        """Update entity."""
-        await self._coordinator.data.get_status()
-
-    @property
-    def should_poll(self) -> bool:
-        """Return True if entity has to be polled for state."""
-        return True
+        return self._status
 
 
 class VemmioMotionSensor(VemmioEntity, BinarySensorEntity):
     """Defines a Vemmio binary sensor."""
 
+    _attr_device_class = BinarySensorDeviceClass.MOTION
+    _priority_updates = True
+
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
-
-        self._attr_device_class = BinarySensorDeviceClass.MOTION
-
         LOGGER.debug("Initializing Vemmio motion sensor")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -113,40 +77,27 @@ class VemmioMotionSensor(VemmioEntity, BinarySensorEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"motion_sensor_{capability.get_uuid_with_id()}"
-        self._capability = capability
-        self._coordinator = coordinator
 
     @property
     def is_on(self) -> bool:
         """Return true if the motion sensor is on."""
-        return self.coordinator.data.get_motion_status_state()
-
-    async def async_update(self) -> None:
-        """Update entity."""
-        await self._coordinator.data.get_status()
-
-    @property
-    def should_poll(self) -> bool:
-        """Return True if entity has to be polled for state."""
-        return True
+        return self._status
 
 
 class VemmioFloodBinarySensor(VemmioEntity, BinarySensorEntity):
     """Defines a Vemmio Flood binary sensor."""
 
+    _attr_device_class = BinarySensorDeviceClass.MOISTURE
+    _priority_updates = True
+
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
-
-        self._attr_device_class = BinarySensorDeviceClass.MOISTURE
-
         LOGGER.debug("Initializing Vemmio flood binary sensor")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -154,20 +105,15 @@ class VemmioFloodBinarySensor(VemmioEntity, BinarySensorEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"binary_sensor_{capability.get_uuid_with_id()}"
-        self._capability = capability
-        self._coordinator = coordinator
 
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        return self.coordinator.data.get_flood_status_state()
+        return self._status
 
-    async def async_update(self) -> None:
-        """Update entity."""
-        await self._coordinator.data.get_status()
 
-    @property
-    def should_poll(self) -> bool:
-        """Return True if entity has to be polled for state."""
-        return True
+BINARY_SENSOR_TYPES: Final = {
+    "openClose": VemmioBinarySensor,
+    "motionDetector": VemmioMotionSensor,
+    "floodDetector": VemmioFloodBinarySensor,
+}
@@ -0,0 +1,142 @@
+"""Relay command queue for Vemmio."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.core import callback
+
+from .const import COMMAND_BATCH_WINDOW, COMMAND_MAX_CONCURRENCY, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import VemmioDataUpdateCoordinator
+
+type RelayKey = tuple[str, int]
+
+
+class RelayCommand(NamedTuple):
+    """A queued relay command and the callers waiting for it."""
+
+    node_uuid: str
+    relay_id: int
+    state: bool
+    futures: list[asyncio.Future[None]]
+
+
+class VemmioCommandQueue:
+    """Batch relay commands issued close together for one Vemmio device.
+
+    Only the latest target state of a relay is kept while its command waits
+    to be sent, and at most one command per relay is in flight. Callers of
+    superseded commands are resolved with the outcome of the command that
+    replaced theirs.
+    """
+
+    def __init__(self, coordinator: VemmioDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._pending: dict[RelayKey, RelayCommand] = {}
+        self._in_flight: set[RelayKey] = set()
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._semaphore = asyncio.Semaphore(COMMAND_MAX_CONCURRENCY)
+
+    async def async_set_relay(self, node_uuid: str, relay_id: int, state: bool) -> None:
+        """Queue a relay command and wait until the device has accepted it."""
+        loop = self._coordinator.hass.loop
+        future: asyncio.Future[None] = loop.create_future()
+        self._coordinator.async_note_activity()
+        relay = (node_uuid, relay_id)
+        futures = [future]
+        if (superseded := self._pending.get(relay)) is not None:
+            self._coordinator.stats.commands_merged += 1
+            futures = [*superseded.futures, future]
+        self._pending[relay] = RelayCommand(node_uuid, relay_id, state, futures)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                COMMAND_BATCH_WINDOW.total_seconds(), self._async_flush
+            )
+        await future
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel commands that have not been sent yet."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for command in self._pending.values():
+            for future in command.futures:
+                future.cancel()
+        self._pending.clear()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the commands of relays that have no command in flight."""
+        self._flush_handle = None
+        batch = [
+            self._pending.pop(relay)
+            for relay in list(self._pending)
+            if relay not in self._in_flight
+        ]
+        if not batch:
+            return
+        for command in batch:
+            self._in_flight.add((command.node_uuid, command.relay_id))
+        LOGGER.debug(
+            "[commands.py] Sending %d relay commands to host %s, %d waiting",
+            len(batch),
+            self._coordinator.vemmio.host,
+            len(self._pending),
+        )
+        self._coordinator.config_entry.async_create_background_task(
+            self._coordinator.hass,
+            self._async_send_batch(batch),
+            "vemmio relay command batch",
+        )
+
+    async def _async_send_batch(self, batch: list[RelayCommand]) -> None:
+        """Send a batch of relay commands with bounded concurrency."""
+        await asyncio.gather(*(self._async_send(command) for command in batch))
+
+    async def _async_send(self, command: RelayCommand) -> None:
+        """Send a single relay command and resolve its waiters."""
+        device = self._coordinator.data
+        try:
+            async with self._semaphore:
+                if command.state:
+                    await device.async_turn_on_switch_by_uuid_and_id(
+                        command.node_uuid, command.relay_id
+                    )
+                else:
+                    await device.async_turn_off_switch_by_uuid_and_id(
+                        command.node_uuid, command.relay_id
+                    )
+        except Exception as error:  # noqa: BLE001
+            self._async_sent(command, error)
+        else:
+            self._async_sent(command, None)
+
+    @callback
+    def _async_sent(self, command: RelayCommand, error: Exception | None) -> None:
+        """Resolve the waiters of a sent command and release its relay."""
+        for future in command.futures:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+        relay = (command.node_uuid, command.relay_id)
+        self._in_flight.discard(relay)
+        if (queued := self._pending.get(relay)) is None:
+            return
+        if error is None and queued.state == command.state:
+            # The relay already has the state queued behind the sent command
+            del self._pending[relay]
+            self._coordinator.stats.commands_merged += 1
+            for future in queued.futures:
+                if not future.done():
+                    future.set_result(None)
+        elif self._flush_handle is None:
+            self._async_flush()
@@ -2,20 +2,61 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable, Mapping
 import random
+import time
 from typing import Any
 
 from vemmio import Device, Vemmio, VemmioConnectionError
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult, OptionsFlow
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigEntryState,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
-
-from .const import DOMAIN, LOGGER
+from homeassistant.util.yaml import parse_yaml
+
+from .const import (
+    CAPABILITY_TYPES,
+    CONF_COPY_FROM,
+    CONF_ENTITIES_NAMES,
+    CONF_ILLUMINATION_AGGREGATION_WINDOW,
+    CONF_ILLUMINATION_DEADBAND,
+    CONF_ILLUMINATION_DEADBAND_PERCENT,
+    CONF_ILLUMINATION_MIN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_NAME_MAPPING,
+    CONF_SHARED_SCHEDULER,
+    CONF_TEMPERATURE_AGGREGATION_WINDOW,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND_PERCENT,
+    CONF_TEMPERATURE_MIN_INTERVAL,
+    DATA_DISCOVERY_PROBES,
+    DISCOVERY_PROBE_TTL,
+    DOMAIN,
+    LOGGER,
+    MAX_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+)
+from .coordinator import snapshot_store
+from .debug import DeviceSummary
 
 
 class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -33,9 +74,14 @@ class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.discovered_device = None
         self.discovered_device_name = ""
         self.discovered_device_id = None
-        self.current_index = 0
         self.entities_names = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsVemmioFlow:
+        """Get the options flow for this handler."""
+        return OptionsVemmioFlow()
+
     async def async_step_user(self, user_input=None) -> ConfigFlowResult:
         """Handle the initial step."""
         if user_input:
@@ -73,15 +119,20 @@ class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         device_name = discovery_info.hostname.removesuffix(".local.")
         LOGGER.debug("Discovered %s ", device_name)
 
+        # Already configured devices re-announce often; do not probe them again
+        await self.async_set_unique_id(device_name)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: discovery_info.host})
+
         try:
-            self.discovered_device = await self._async_get_device(discovery_info.host)
-            LOGGER.debug("Discovered device %s", str(self.discovered_device))
+            self.discovered_device = await self._async_probe_device(
+                discovery_info.hostname, discovery_info.host
+            )
+            LOGGER.debug(
+                "Discovered device %s", DeviceSummary(self.discovered_device)
+            )
         except VemmioConnectionError:
             return self.async_abort(reason="cannot_connect")
 
-        await self.async_set_unique_id(device_name)
-        self._abort_if_unique_id_configured(updates={CONF_HOST: discovery_info.host})
-
         # Save discovery info for use in setup
         self.context["title_placeholders"] = {"name": device_name}
         self.discovered_device_name = device_name
@@ -92,43 +143,115 @@ class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_name_entities(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Step through each entity and ask for a name."""
+        """Ask for the names of all entities in a single form."""
+        capabilities = {
+            capability.get_uuid_with_id(): capability.get_name()
+            for capability in self.discovered_device.capabilities
+        }
+        other_entries = {
+            entry.entry_id: entry.title
+            for entry in self._async_current_entries(include_ignore=False)
+            if entry.data.get(CONF_ENTITIES_NAMES)
+        }
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            # Save the name for the current entity
-            uuid_with_id = self.discovered_device.capabilities[
-                self.current_index
-            ].get_uuid_with_id()
-            self.entities_names[uuid_with_id] = user_input["name"]
-            self.current_index += 1
-
-            # If more entities left, repeat
-            if self.current_index < len(self.discovered_device.capabilities):
-                return await self.async_step_name_entities()
-
-            # Otherwise, finish
-            return self.async_create_entry(
-                title=self.discovered_device_name,
-                data={
-                    CONF_HOST: self.discovered_host,
-                    "device_name": self.discovered_device_name,
-                    "device_id": self.discovered_device_name,
-                    "entities_names": self.entities_names,
-                },
-            )
+            names = {
+                key: user_input.get(key, name) for key, name in capabilities.items()
+            }
+            if copy_from := user_input.get(CONF_COPY_FROM):
+                if copied := await self._async_copy_names(copy_from):
+                    names.update(copied)
+                else:
+                    errors[CONF_COPY_FROM] = "no_names_copied"
+            if mapping := user_input.get(CONF_NAME_MAPPING):
+                try:
+                    pasted = _parse_name_mapping(mapping, capabilities)
+                except vol.Invalid:
+                    errors[CONF_NAME_MAPPING] = "invalid_name_mapping"
+                else:
+                    if pasted:
+                        names.update(pasted)
+                    else:
+                        errors[CONF_NAME_MAPPING] = "no_names_matched"
+
+            if not errors:
+                self.entities_names = names
+                return self.async_create_entry(
+                    title=self.discovered_device_name,
+                    data={
+                        CONF_HOST: self.discovered_host,
+                        "device_name": self.discovered_device_name,
+                        "device_id": self.discovered_device_name,
+                        CONF_ENTITIES_NAMES: self.entities_names,
+                    },
+                )
 
-        # Ask user to name the current entity
-        capabilityName = self.discovered_device.capabilities[
-            self.current_index
-        ].get_name()
+        schema: dict[vol.Marker, Any] = {
+            vol.Required(key, default=name): str for key, name in capabilities.items()
+        }
+        if other_entries:
+            schema[vol.Optional(CONF_COPY_FROM)] = SelectSelector(
+                SelectSelectorConfig(
+                    options=[
+                        SelectOptionDict(value=entry_id, label=title)
+                        for entry_id, title in other_entries.items()
+                    ]
+                )
+            )
+        schema[vol.Optional(CONF_NAME_MAPPING)] = TextSelector(
+            TextSelectorConfig(multiline=True)
+        )
         return self.async_show_form(
             step_id="name_entities",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("name", default=capabilityName): str,
-                }
-            ),
-            description_placeholders={"capabilityName": capabilityName},
+            data_schema=vol.Schema(schema),
+            errors=errors,
+            description_placeholders={"count": str(len(capabilities))},
+        )
+
+    async def _async_copy_names(self, entry_id: str) -> dict[str, str]:
+        """Return the names another entry uses for this device's capabilities.
+
+        Capability keys contain the node UUID, which differs between devices,
+        so capabilities are matched by type and position on the device.
+        """
+        if (entry := self.hass.config_entries.async_get_entry(entry_id)) is None:
+            return {}
+        if entry.state is ConfigEntryState.LOADED:
+            index = entry.runtime_data.capabilities
+            other_keys = {
+                capability_type: list(capabilities)
+                for capability_type, capabilities in index.items()
+            }
+        else:
+            # The capabilities of an entry that is not loaded are only known
+            # from its stored snapshot
+            snapshot = await snapshot_store(self.hass, entry).async_load()
+            if snapshot is None:
+                return {}
+            other_keys = {
+                capability_type: [capability["key"] for capability in capabilities]
+                for capability_type, capabilities in snapshot["capabilities"].items()
+            }
+
+        other_slots = _capability_slots(other_keys)
+        other_names = entry.data[CONF_ENTITIES_NAMES]
+        slots = _capability_slots(
+            {
+                capability_type: [
+                    capability.get_uuid_with_id()
+                    for capability in self.discovered_device.get_capabilities(
+                        capability_type
+                    )
+                ]
+                for capability_type in CAPABILITY_TYPES
+            }
         )
+        return {
+            key: other_names[other_key]
+            for slot, key in slots.items()
+            if (other_key := other_slots.get(slot)) in other_names
+        }
 
     async def async_step_zeroconf_confirm(
         self, user_input: dict[str, Any] | None = None
@@ -145,6 +268,29 @@ class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"name": self.discovered_device_name},
         )
 
+    async def _async_probe_device(self, hostname: str, host: str) -> Device:
+        """Probe a discovered device, sharing recent and in-flight probes."""
+        probes: dict[tuple[str, str], tuple[float, asyncio.Task[Device]]]
+        probes = self.hass.data.setdefault(DATA_DISCOVERY_PROBES, {})
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in probes.items() if expires <= now]:
+            del probes[key]
+
+        key = (hostname, host)
+        if key in probes:
+            task = probes[key][1]
+        else:
+            task = self.hass.async_create_task(self._async_get_device(host))
+            probes[key] = (now + DISCOVERY_PROBE_TTL.total_seconds(), task)
+
+        try:
+            return await asyncio.shield(task)
+        except VemmioConnectionError:
+            # Let the next announcement probe an unreachable device again
+            if key in probes and probes[key][1] is task:
+                del probes[key]
+            raise
+
     async def _async_get_device(self, host: str) -> Device:
         """Get device information from Vemmio device."""
         session = async_get_clientsession(self.hass)
@@ -153,6 +299,30 @@ class VemmioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return await vemmio.update()
 
 
+def _capability_slots(
+    keys: Mapping[str, Iterable[str]],
+) -> dict[tuple[str, int], str]:
+    """Key capability keys by capability type and position on the device."""
+    return {
+        (capability_type, index): key
+        for capability_type, keys_of_type in keys.items()
+        for index, key in enumerate(keys_of_type)
+    }
+
+
+def _parse_name_mapping(mapping: str, capabilities: dict[str, str]) -> dict[str, str]:
+    """Parse a pasted YAML or JSON mapping of capability keys to entity names."""
+    try:
+        parsed = parse_yaml(mapping)
+    except HomeAssistantError as error:
+        raise vol.Invalid(str(error)) from error
+    if not isinstance(parsed, dict):
+        raise vol.Invalid("Name mapping must be a mapping")
+    return {
+        str(key): str(name) for key, name in parsed.items() if str(key) in capabilities
+    }
+
+
 class OptionsVemmioFlow(OptionsFlow):
     """Handle options flow for Vemmio."""
 
@@ -160,14 +330,48 @@ class OptionsVemmioFlow(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "min_above_max"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema: dict[vol.Marker, Any] = {
+            vol.Optional(
+                CONF_MIN_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MIN_SCAN_INTERVAL, int(SCAN_INTERVAL.total_seconds())
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                CONF_MAX_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MAX_SCAN_INTERVAL, int(MAX_SCAN_INTERVAL.total_seconds())
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                CONF_SHARED_SCHEDULER,
+                default=options.get(CONF_SHARED_SCHEDULER, False),
+            ): bool,
+        }
+        for option in (
+            CONF_TEMPERATURE_MIN_INTERVAL,
+            CONF_TEMPERATURE_DEADBAND,
+            CONF_TEMPERATURE_DEADBAND_PERCENT,
+            CONF_TEMPERATURE_AGGREGATION_WINDOW,
+            CONF_ILLUMINATION_MIN_INTERVAL,
+            CONF_ILLUMINATION_DEADBAND,
+            CONF_ILLUMINATION_DEADBAND_PERCENT,
+            CONF_ILLUMINATION_AGGREGATION_WINDOW,
+        ):
+            schema[vol.Optional(option, default=options.get(option, 0.0))] = vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            )
+
         return self.async_show_form(
-            step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("option_1"): str,
-                    vol.Required("option_2", default=1883): int,
-                }
-            ),
+            step_id="init", data_schema=vol.Schema(schema), errors=errors
         )
 
 
@@ -5,4 +5,73 @@ import logging
 
 DOMAIN = "vemmio"
 SCAN_INTERVAL = timedelta(seconds=60)  # in seconds
+# Upper bound for the adaptive polling interval of a quiet device
+MAX_SCAN_INTERVAL = timedelta(minutes=10)
+# Full refresh interval used while the websocket keeps delivering frames
+RECONCILE_INTERVAL = timedelta(minutes=15)
+# Interval at which the connection state of the websocket is checked
+WEBSOCKET_CHECK_INTERVAL = timedelta(seconds=15)
+# Bounds of the backoff between websocket reconnect attempts; a new websocket
+# is given the shortest delay to connect before it is reconnected
+WEBSOCKET_RECONNECT_MIN_DELAY = timedelta(seconds=10)
+WEBSOCKET_RECONNECT_MAX_DELAY = timedelta(minutes=10)
+# Concurrent status requests within this window share a single device request
+STATUS_COALESCE_WINDOW = timedelta(seconds=1)
+
+# Capability types exposed as entities
+CAPABILITY_TYPES = (
+    "switch",
+    "openClose",
+    "motionDetector",
+    "floodDetector",
+    "temperature",
+    "illumination",
+)
+# Prefix of the unique ID of the entity of each capability type
+UNIQUE_ID_PREFIXES = {
+    "switch": "switch",
+    "openClose": "binary_sensor",
+    "motionDetector": "motion_sensor",
+    "floodDetector": "binary_sensor",
+    "temperature": "temperature_sensor",
+    "illumination": "illumination_sensor",
+}
+# Time a switch waits for the device to confirm an optimistic state
+SWITCH_CONFIRM_TIMEOUT = timedelta(seconds=5)
+# Relay commands issued within this window are sent as one batch
+COMMAND_BATCH_WINDOW = timedelta(milliseconds=5)
+# Maximum number of relay commands in flight to a single device
+COMMAND_MAX_CONCURRENCY = 4
+# Maximum number of Vemmio devices refreshed at the same time by the shared
+# refresh scheduler
+REFRESH_MAX_CONCURRENCY = 4
+# Interval at which the runtime statistics sensors are updated
+STATS_UPDATE_INTERVAL = timedelta(seconds=30)
+# Persisted device snapshot used to set up entities before the first refresh
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # in seconds
+# Zeroconf probe results are shared between announcements for this long
+DISCOVERY_PROBE_TTL = timedelta(seconds=60)
+DATA_DISCOVERY_PROBES = f"{DOMAIN}_discovery_probes"
+# Refreshes in a row a capability must be missing from before its entity is
+# removed; until then the entity is only unavailable
+CAPABILITY_REMOVAL_REFRESHES = 3
+# Dispatcher signal for capabilities appearing on a device
+SIGNAL_CAPABILITIES_ADDED = f"{DOMAIN}_capabilities_added_{{entry_id}}"
+
+CONF_ENTITIES_NAMES = "entities_names"
+CONF_COPY_FROM = "copy_from"
+CONF_NAME_MAPPING = "name_mapping"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_SHARED_SCHEDULER = "shared_scheduler"
+CONF_TEMPERATURE_MIN_INTERVAL = "temperature_min_interval"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_TEMPERATURE_DEADBAND_PERCENT = "temperature_deadband_percent"
+CONF_TEMPERATURE_AGGREGATION_WINDOW = "temperature_aggregation_window"
+CONF_ILLUMINATION_MIN_INTERVAL = "illumination_min_interval"
+CONF_ILLUMINATION_DEADBAND = "illumination_deadband"
+CONF_ILLUMINATION_DEADBAND_PERCENT = "illumination_deadband_percent"
+CONF_ILLUMINATION_AGGREGATION_WINDOW = "illumination_aggregation_window"
+
 LOGGER = logging.getLogger("homeassistant.components.vemmio")
@@ -2,15 +2,75 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import datetime, timedelta
+import random
+import time
+from typing import Any, Final
+
 from vemmio import Device as VemmioDevice, Vemmio, VemmioError
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, LOGGER, SCAN_INTERVAL
+from .commands import VemmioCommandQueue
+from .const import (
+    CAPABILITY_REMOVAL_REFRESHES,
+    CAPABILITY_TYPES,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_SHARED_SCHEDULER,
+    DOMAIN,
+    LOGGER,
+    MAX_SCAN_INTERVAL,
+    RECONCILE_INTERVAL,
+    SCAN_INTERVAL,
+    SIGNAL_CAPABILITIES_ADDED,
+    SNAPSHOT_SAVE_DELAY,
+    STATUS_COALESCE_WINDOW,
+    STORAGE_VERSION,
+    WEBSOCKET_CHECK_INTERVAL,
+    WEBSOCKET_RECONNECT_MAX_DELAY,
+    WEBSOCKET_RECONNECT_MIN_DELAY,
+)
+from .debug import DeviceSummary
+from .models import StatusKey, VemmioCapability
+from .scheduler import VemmioRefreshScheduler, async_register_coordinator
+from .stats import VemmioStats
+from .websocket import VemmioWebsocketManager
+
+
+type StatusReader = Callable[[VemmioDevice, VemmioCapability], Any]
+
+# A device has a single sensor of each kind, so the sensor getters take no
+# node or capability id.
+STATUS_READERS: Final[dict[str, StatusReader]] = {
+    "switch": lambda device, capability: device.get_relay_state(
+        capability.node_uuid, capability.id
+    ),
+    "openClose": lambda device, capability: device.get_input_state(
+        capability.node_uuid, capability.id
+    ),
+    "motionDetector": lambda device, _: device.get_motion_status_state(),
+    "floodDetector": lambda device, _: device.get_flood_status_state(),
+    "temperature": lambda device, _: device.get_temperature_status_value(),
+    "illumination": lambda device, _: device.get_illumination_status_value(),
+}
+
+
+def snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    """Return the store holding the device snapshot of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
 
 
 class VemmioDataUpdateCoordinator(DataUpdateCoordinator[VemmioDevice]):
@@ -18,6 +78,7 @@ class VemmioDataUpdateCoordinator(DataUpdateCoordinator[VemmioDevice]):
 
     config_entry: ConfigEntry
     device: VemmioDevice
+    device_info: DeviceInfo
 
     def __init__(
         self,
@@ -31,13 +92,52 @@ class VemmioDataUpdateCoordinator(DataUpdateCoordinator[VemmioDevice]):
 
         session = async_get_clientsession(hass)
         self.vemmio = Vemmio(entry.data[CONF_HOST], session)
+        self.websocket = VemmioWebsocketManager(self)
+        self.commands = VemmioCommandQueue(self)
+        self.stats = VemmioStats()
+        self.capabilities: dict[str, dict[str, VemmioCapability]] = {}
+        self._capabilities_by_key: dict[str, VemmioCapability] = {}
+        # Consecutive refreshes each missing capability has been absent from
+        self.missing_capabilities: dict[str, int] = {}
+        self._device_info_key: tuple[str, str, str] | None = None
+        self._store = snapshot_store(hass, entry)
+        self._snapshot: dict[str, Any] | None = None
+        self.status: dict[StatusKey, Any] = {}
+        self._pushed_changes = False
+        self._reconnect_attempts = 0
+        self._next_reconnect = 0.0
+        self.push_mode = False
+        self._min_interval = timedelta(
+            seconds=entry.options.get(
+                CONF_MIN_SCAN_INTERVAL, SCAN_INTERVAL.total_seconds()
+            )
+        )
+        self._max_interval = timedelta(
+            seconds=entry.options.get(
+                CONF_MAX_SCAN_INTERVAL, MAX_SCAN_INTERVAL.total_seconds()
+            )
+        )
+        self._poll_interval = self._min_interval
+        self._failures = 0
+        self._status_request: asyncio.Task[Any] | None = None
+        self._status_fetched = 0.0
 
         super().__init__(
             hass,
             LOGGER,
             config_entry=entry,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=self._min_interval,
+        )
+
+        self.scheduler: VemmioRefreshScheduler | None = None
+        if entry.options.get(CONF_SHARED_SCHEDULER, False):
+            self.scheduler, unregister = async_register_coordinator(hass, self)
+            entry.async_on_unload(unregister)
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, self._async_check_websocket, WEBSOCKET_CHECK_INTERVAL
+            )
         )
 
     async def _async_update_data(self) -> VemmioDevice:
@@ -47,11 +147,474 @@ class VemmioDataUpdateCoordinator(DataUpdateCoordinator[VemmioDevice]):
             "[coordinator.py] Updating Vemmio data from host %s", self.vemmio.host
         )
         try:
-            device = await self.vemmio.update()
+            async with self._refresh_slot():
+                started = time.monotonic()
+                device = self.device = await self.vemmio.update()
+                # update() only fetches the device info; relay, input and
+                # sensor values are refreshed by the shared status request.
+                await self.async_get_status()
+                self.stats.refresh_latency.record(time.monotonic() - started)
         except VemmioError as error:
+            self.stats.refresh_failures += 1
+            self._async_back_off()
             raise UpdateFailed(f"Invalid response from API: {error}") from error
 
-        LOGGER.debug("Vemmio data: %s", str(device))
+        LOGGER.debug("Vemmio data: %s", DeviceSummary(device))
 
-        self.device = device
+        info = device.model.info
+        identity = {
+            "mac": info.mac,
+            "type": info.type,
+            "fw": info.fw,
+            "revision": info.revision,
+        }
+        self._async_update_device_info(identity)
+        capabilities = self._build_capability_index(device)
+        presence_changed: list[str] = []
+        if capabilities != self.capabilities or self.missing_capabilities:
+            presence_changed = self._async_update_capabilities(capabilities)
+        self._async_save_snapshot(identity)
+        changed = self._async_patch_status(device)
+        self._async_adapt_interval(changed=bool(changed) or self._pushed_changes)
+        self._pushed_changes = False
+        if self.websocket.async_attach(device):
+            self._async_wait_for_websocket()
+        # Only entities of changed capabilities are told about the new model
+        self.websocket.async_dispatch([*changed, *presence_changed])
         return device
+
+    def _refresh_slot(self) -> AbstractAsyncContextManager[Any]:
+        """Return the slot a refresh runs in, shared with other devices if enabled."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.async_refresh_slot()
+
+    @callback
+    def async_schedule_staggered_refresh(self) -> None:
+        """Refresh at this device's offset within the polling interval.
+
+        The following refreshes keep that offset, so devices sharing the
+        scheduler do not all refresh at the same moment.
+        """
+        if self.scheduler is None:
+            return
+        delay = self.scheduler.refresh_offset(self, self._min_interval)
+        LOGGER.debug(
+            "[coordinator.py] Refreshing host %s with an offset of %s",
+            self.vemmio.host,
+            delay,
+        )
+
+        @callback
+        def _async_refresh(_now: datetime) -> None:
+            """Start the staggered refresh."""
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self.async_refresh(),
+                f"vemmio refresh {self.config_entry.entry_id}",
+            )
+
+        self.config_entry.async_on_unload(
+            async_call_later(self.hass, delay, _async_refresh)
+        )
+
+    @callback
+    def _async_patch_status(self, device: VemmioDevice) -> list[str]:
+        """Rebuild the status table and return the keys whose value changed."""
+        status: dict[StatusKey, Any] = {}
+        changed: list[str] = []
+        for key, capability in self._capabilities_by_key.items():
+            if key in self.missing_capabilities:
+                continue
+            status_key = capability.status_key
+            value = STATUS_READERS[capability.type](device, capability)
+            if status_key not in self.status or self.status[status_key] != value:
+                changed.append(key)
+            status[status_key] = value
+        self.status = status
+        return changed
+
+    @callback
+    def async_patch_capability(
+        self, key: str, device: VemmioDevice | None = None
+    ) -> bool:
+        """Re-read a single capability into the status table.
+
+        The capability is read from the given device model, by default the
+        one of the last refresh. Returns whether its value changed.
+        """
+        capability = self._capabilities_by_key.get(key)
+        if device is None:
+            device = self.data
+        if device is None or capability is None:
+            return False
+        status_key = capability.status_key
+        value = STATUS_READERS[capability.type](device, capability)
+        if status_key in self.status and self.status[status_key] == value:
+            return False
+        self.status[status_key] = value
+        return True
+
+    def capability_status(self, capability: VemmioCapability) -> Any:
+        """Return the last known status of a capability."""
+        return self.status.get(capability.status_key)
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll at the shortest interval again after a user command."""
+        self._async_adapt_interval(changed=True)
+
+    @callback
+    def _async_adapt_interval(self, *, changed: bool) -> None:
+        """Poll more often after changes and less often while nothing changes."""
+        self._failures = 0
+        if changed:
+            self._poll_interval = self._min_interval
+        else:
+            self._poll_interval = min(self._poll_interval * 2, self._max_interval)
+        self._async_apply_interval()
+
+    @callback
+    def _async_back_off(self) -> None:
+        """Back off exponentially with jitter after a failed refresh."""
+        self._failures += 1
+        backoff = self._min_interval * min(2**self._failures, 64)
+        self._poll_interval = min(
+            backoff * random.uniform(0.8, 1.2), self._max_interval
+        )
+        LOGGER.debug(
+            "[coordinator.py] Refresh of host %s failed %d times, retrying in %s",
+            self.vemmio.host,
+            self._failures,
+            self._poll_interval,
+        )
+        self._async_apply_interval()
+
+    @callback
+    def _async_apply_interval(self) -> None:
+        """Set the refresh interval for the current polling mode."""
+        if self.push_mode:
+            self.update_interval = max(RECONCILE_INTERVAL, self._poll_interval)
+        else:
+            self.update_interval = self._poll_interval
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore device info and capabilities from the last stored snapshot."""
+        if (snapshot := await self._store.async_load()) is None:
+            return False
+
+        try:
+            capabilities = {
+                capability_type: {
+                    capability["key"]: VemmioCapability.from_dict(capability)
+                    for capability in capabilities
+                }
+                for capability_type, capabilities in snapshot["capabilities"].items()
+            }
+            self._async_update_device_info(snapshot["device"])
+        except (KeyError, TypeError) as error:
+            LOGGER.warning(
+                "Ignoring invalid Vemmio snapshot for host %s: %r",
+                self.vemmio.host,
+                error,
+            )
+            return False
+
+        self._async_set_capabilities(capabilities)
+        self._snapshot = snapshot
+        return True
+
+    @callback
+    def _async_update_capabilities(
+        self, capabilities: dict[str, dict[str, VemmioCapability]]
+    ) -> list[str]:
+        """Replace the capability index and announce added and removed ones.
+
+        A capability missing from a refresh stays in the index, with its
+        entity unavailable, until it has been missing from
+        CAPABILITY_REMOVAL_REFRESHES refreshes in a row. Returns the keys of
+        capabilities that went missing or came back.
+        """
+        previous = self._capabilities_by_key
+        current = {key for of_type in capabilities.values() for key in of_type}
+        presence_changed = [key for key in self.missing_capabilities if key in current]
+        for key in presence_changed:
+            del self.missing_capabilities[key]
+
+        removed: list[str] = []
+        for key, capability in previous.items():
+            if key in current:
+                continue
+            missing = self.missing_capabilities.get(key, 0) + 1
+            if missing >= CAPABILITY_REMOVAL_REFRESHES:
+                self.missing_capabilities.pop(key, None)
+                removed.append(key)
+                continue
+            if missing == 1:
+                presence_changed.append(key)
+            self.missing_capabilities[key] = missing
+            capabilities.setdefault(capability.type, {})[key] = capability
+        self._async_set_capabilities(capabilities)
+
+        added = [
+            capability
+            for key, capability in self._capabilities_by_key.items()
+            if key not in previous
+        ]
+        LOGGER.debug(
+            "[coordinator.py] Capabilities of host %s changed: %d added, "
+            "%d missing, %d removed",
+            self.vemmio.host,
+            len(added),
+            len(self.missing_capabilities),
+            len(removed),
+        )
+        entry_id = self.config_entry.entry_id
+        if added:
+            async_dispatcher_send(
+                self.hass, SIGNAL_CAPABILITIES_ADDED.format(entry_id=entry_id), added
+            )
+        if removed:
+            self._async_remove_entities([previous[key] for key in removed])
+        return presence_changed
+
+    @callback
+    def _async_remove_entities(self, capabilities: list[VemmioCapability]) -> None:
+        """Remove the entities of capabilities that left the device.
+
+        The registry entries are removed here rather than by the entities,
+        as disabled entities are never added to Home Assistant; removing an
+        entry also removes its entity if it is loaded.
+        """
+        for capability in capabilities:
+            self.status.pop(capability.status_key, None)
+        unique_ids = {capability.unique_id for capability in capabilities}
+        entity_registry = er.async_get(self.hass)
+        for entity_entry in er.async_entries_for_config_entry(
+            entity_registry, self.config_entry.entry_id
+        ):
+            if entity_entry.unique_id in unique_ids:
+                entity_registry.async_remove(entity_entry.entity_id)
+
+    @callback
+    def _async_set_capabilities(
+        self, capabilities: dict[str, dict[str, VemmioCapability]]
+    ) -> None:
+        """Replace the capability index."""
+        self.capabilities = capabilities
+        self._capabilities_by_key = {
+            key: capability
+            for capabilities_of_type in capabilities.values()
+            for key, capability in capabilities_of_type.items()
+        }
+
+    @callback
+    def _async_save_snapshot(self, identity: dict[str, str]) -> None:
+        """Schedule storing the device snapshot when it changed."""
+        snapshot = {
+            "device": identity,
+            "capabilities": {
+                capability_type: [
+                    capability.as_dict() for capability in capabilities.values()
+                ]
+                for capability_type, capabilities in self.capabilities.items()
+            },
+        }
+        if snapshot == self._snapshot:
+            return
+
+        self._snapshot = snapshot
+        self._store.async_delay_save(lambda: snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _async_update_device_info(self, identity: dict[str, str]) -> None:
+        """Rebuild the shared device info when the device identity changes."""
+        key = (identity["mac"], identity["fw"], identity["revision"])
+        if key == self._device_info_key:
+            return
+
+        mac, device_type = identity["mac"], identity["type"]
+        # Last 3 bytes of mac address
+        mac_id = mac.replace(":", "")[-6:]
+        self.device_info = DeviceInfo(
+            connections={(CONNECTION_NETWORK_MAC, mac)},
+            identifiers={(DOMAIN, mac)},
+            name=f"VEMMIO-{device_type}-{mac_id}".upper(),
+            manufacturer="Vemmio",
+            model=device_type,
+            sw_version=identity["fw"],
+            hw_version=identity["revision"],
+            configuration_url=f"http://{self.vemmio.host}",
+        )
+
+        first_refresh = self._device_info_key is None
+        self._device_info_key = key
+        if first_refresh:
+            return
+
+        LOGGER.debug(
+            "[coordinator.py] Device info of host %s changed to fw=%s rev=%s",
+            self.vemmio.host,
+            identity["fw"],
+            identity["revision"],
+        )
+        device_registry = dr.async_get(self.hass)
+        if device_entry := device_registry.async_get_device(
+            identifiers={(DOMAIN, mac)}
+        ):
+            device_registry.async_update_device(
+                device_entry.id,
+                sw_version=identity["fw"],
+                hw_version=identity["revision"],
+            )
+
+    @staticmethod
+    def _build_capability_index(
+        device: VemmioDevice,
+    ) -> dict[str, dict[str, VemmioCapability]]:
+        """Group device capabilities by type and key them by UUID and ID.
+
+        vemmio 0.1.1 builds the capabilities of a Device once, and update()
+        keeps returning that Device, so with that client capabilities added
+        to or removed from a running device are only picked up when the
+        config entry is reloaded.
+        """
+        return {
+            capability_type: {
+                capability.get_uuid_with_id(): VemmioCapability.from_capability(
+                    capability_type, capability
+                )
+                for capability in device.get_capabilities(capability_type)
+            }
+            for capability_type in CAPABILITY_TYPES
+        }
+
+    async def async_shutdown(self) -> None:
+        """Shut down the coordinator, its command queue and websocket listeners."""
+        await super().async_shutdown()
+        self.commands.async_shutdown()
+        self.websocket.async_shutdown()
+
+    async def async_get_status(self) -> Any:
+        """Fetch the device status, sharing one request between callers.
+
+        Callers arriving shortly after a request completed share its outcome,
+        so a failed request raises for every caller that joined it.
+        """
+        request = self._status_request
+        if request is None or (
+            request.done()
+            and time.monotonic() - self._status_fetched
+            >= STATUS_COALESCE_WINDOW.total_seconds()
+        ):
+            request = self._status_request = self.hass.async_create_task(
+                self._async_fetch_status()
+            )
+        return await asyncio.shield(request)
+
+    async def _async_fetch_status(self) -> Any:
+        """Fetch the device status once."""
+        LOGGER.debug(
+            "[coordinator.py] Fetching Vemmio status from host %s", self.vemmio.host
+        )
+        try:
+            return await self.device.get_status()
+        finally:
+            self._status_fetched = time.monotonic()
+
+    @callback
+    def async_websocket_frame(self, key: str, device: VemmioDevice) -> bool:
+        """Patch the status table from a websocket frame.
+
+        The client calls the callbacks of all capabilities, of every device,
+        for each frame, so only a changed value tells that the frame was for
+        this capability. Such a frame is recorded once, through the
+        capability it changed. Returns whether the value changed.
+        """
+        if not self.async_patch_capability(key, device):
+            return False
+        self.stats.record_frame()
+        self._pushed_changes = True
+        self._async_websocket_connected()
+        return True
+
+    @callback
+    def _async_wait_for_websocket(self) -> None:
+        """Give a newly opened websocket time to connect before reconnecting."""
+        self._next_reconnect = (
+            time.monotonic() + WEBSOCKET_RECONNECT_MIN_DELAY.total_seconds()
+        )
+
+    @callback
+    def _async_websocket_connected(self) -> None:
+        """Stretch polling to the reconcile interval while the websocket is up."""
+        self._reconnect_attempts = 0
+        if self.push_mode:
+            return
+
+        LOGGER.debug(
+            "[coordinator.py] Websocket connected for host %s, reconciling every %s",
+            self.vemmio.host,
+            RECONCILE_INTERVAL,
+        )
+        self.push_mode = True
+        self._async_apply_interval()
+
+    @callback
+    def _async_check_websocket(self, _now: datetime) -> None:
+        """Supervise the websocket and reconnect it once it is disconnected.
+
+        Liveness comes from the connection state reported by the client, so a
+        quiet device with a healthy websocket stays in push mode.
+        """
+        if not self.websocket.attached:
+            # The websocket is opened by the first successful refresh
+            return
+        if self.websocket.connected:
+            self._async_websocket_connected()
+            return
+
+        if self.push_mode:
+            # Changes are no longer pushed; poll until the websocket is back
+            LOGGER.debug(
+                "[coordinator.py] Websocket of host %s disconnected, polling every %s",
+                self.vemmio.host,
+                self._min_interval,
+            )
+            self.push_mode = False
+            self._async_adapt_interval(changed=True)
+
+        now = time.monotonic()
+        if now < self._next_reconnect:
+            return
+
+        delay = min(
+            WEBSOCKET_RECONNECT_MIN_DELAY * 2**self._reconnect_attempts,
+            WEBSOCKET_RECONNECT_MAX_DELAY,
+        ) * random.uniform(0.8, 1.2)
+        self._reconnect_attempts += 1
+        self._next_reconnect = now + delay.total_seconds()
+        LOGGER.debug(
+            "[coordinator.py] Reconnecting websocket of host %s (attempt %d)",
+            self.vemmio.host,
+            self._reconnect_attempts,
+        )
+        self.websocket.async_reconnect()
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_resync(), f"vemmio resync {self.vemmio.host}"
+        )
+
+    async def _async_resync(self) -> None:
+        """Fetch the status once and dispatch what changed while disconnected."""
+        try:
+            await self.async_get_status()
+        except VemmioError as error:
+            LOGGER.debug(
+                "[coordinator.py] Resync of host %s failed: %s",
+                self.vemmio.host,
+                error,
+            )
+            return
+
+        if self.data is not None:
+            self.websocket.async_dispatch(self._async_patch_status(self.data))
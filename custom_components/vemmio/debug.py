@@ -0,0 +1,39 @@
+"""Lazy debug formatting helpers for Vemmio."""
+
+from __future__ import annotations
+
+from vemmio import Device as VemmioDevice
+
+# Capabilities listed in a device summary before the rest are elided
+SUMMARY_MAX_CAPABILITIES = 10
+
+
+class DeviceSummary:
+    """Size-capped device description, formatted only when a log record is emitted."""
+
+    __slots__ = ("_device", "_limit")
+
+    def __init__(
+        self, device: VemmioDevice | None, limit: int = SUMMARY_MAX_CAPABILITIES
+    ) -> None:
+        """Initialize."""
+        self._device = device
+        self._limit = limit
+
+    def __str__(self) -> str:
+        """Return the summary."""
+        if self._device is None:
+            return "<no device data>"
+
+        info = self._device.model.info
+        capabilities = self._device.capabilities
+        keys = [
+            capability.get_uuid_with_id()
+            for capability in capabilities[: self._limit]
+        ]
+        if len(capabilities) > self._limit:
+            keys.append(f"+{len(capabilities) - self._limit} more")
+        return (
+            f"type={info.type} mac={info.mac} fw={info.fw} rev={info.revision} "
+            f"capabilities({len(capabilities)})=[{', '.join(keys)}]"
+        )
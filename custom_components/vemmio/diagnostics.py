@@ -0,0 +1,37 @@
+"""Diagnostics support for Vemmio."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from . import VemmioConfigEntry
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: VemmioConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    scheduler = hass.data.get(DOMAIN)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "push_mode": coordinator.push_mode,
+            "capabilities": {
+                capability_type: len(capabilities)
+                for capability_type, capabilities in coordinator.capabilities.items()
+            },
+        },
+        "stats": coordinator.stats.as_dict(),
+        "scheduler": asdict(scheduler.stats) if scheduler is not None else None,
+    }
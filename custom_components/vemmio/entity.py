@@ -1,107 +1,100 @@
 """Base entity for Vemmio."""
 
-from collections.abc import Callable
+from __future__ import annotations
 
-from vemmio import Capability, DeviceModel
+from collections.abc import Callable, Mapping
+from typing import Any
 
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER
+from .const import LOGGER, SIGNAL_CAPABILITIES_ADDED
 from .coordinator import VemmioDataUpdateCoordinator
+from .models import VemmioCapability
 from . import VemmioConfigEntry
 
 
 @callback
-def async_setup_attribute_entities_by_capability(
-    hass: HomeAssistant,
+def async_setup_entities(
     config_entry: VemmioConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    coordinator: VemmioDataUpdateCoordinator,
-    entity_class: Callable,
-    capability_type: str,
+    entity_types: Mapping[str, Callable[..., VemmioEntity]],
 ) -> None:
-    """Set up Vemmio entities based on device capabilities."""
+    """Set up Vemmio entities from the coordinator capability index."""
+    coordinator = config_entry.runtime_data
+    entities_names = config_entry.data["entities_names"]
     entities = []
 
-    LOGGER.debug(
-        "[async_setup_attribute_entities_by_capability] Add entities of capability type: %s",
-        capability_type,
-    )
-
-    device_capabilities = coordinator.data.get_capabilities(capability_type)
-
-    LOGGER.debug(
-        "[async_setup_attribute_entities_by_capability] Device capabilities: %s",
-        str(device_capabilities),
-    )
-
-    for capability in device_capabilities:
+    for capability_type, entity_class in entity_types.items():
+        capabilities = coordinator.capabilities.get(capability_type, {})
         LOGGER.debug(
-            "[async_setup_attribute_entities_by_capability] Adding entity for capability: %s",
-            str(capability),
+            "[async_setup_entities] Adding %d entities of capability type: %s",
+            len(capabilities),
+            capability_type,
         )
-        entities.append(
-            entity_class(coordinator, capability, config_entry.data["entities_names"])
+        entities.extend(
+            entity_class(coordinator, capability, entities_names)
+            for capability in capabilities.values()
         )
 
-    async_add_entities(entities, True)
-
-
-@callback
-def async_setup_attribute_entities_switches(
-    hass: HomeAssistant,
-    config_entry: VemmioConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-    coordinator: VemmioDataUpdateCoordinator,
-    entity_class: Callable,
-) -> None:
-    """Set up Vemmio switch entities based on device capabilities."""
-    entities = []
-
-    device_capabilities = coordinator.data.get_capabilities("switch")
-
-    LOGGER.debug(
-        "[async_setup_attribute_entities_switches] Device capabilities: %s",
-        str(device_capabilities),
-    )
+    async_add_entities(entities)
 
-    for capability in device_capabilities:
-        LOGGER.debug(
-            "[async_setup_attribute_entities_switches] Adding entity for capability: %s",
-            str(capability),
-        )
-        entities.append(
-            entity_class(coordinator, capability, config_entry.data["entities_names"])
+    @callback
+    def async_add_new_capabilities(capabilities: list[VemmioCapability]) -> None:
+        """Add entities for capabilities that appeared on the device."""
+        async_add_entities(
+            entity_types[capability.type](coordinator, capability, entities_names)
+            for capability in capabilities
+            if capability.type in entity_types
         )
 
-    async_add_entities(entities, True)
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            coordinator.hass,
+            SIGNAL_CAPABILITIES_ADDED.format(entry_id=config_entry.entry_id),
+            async_add_new_capabilities,
+        )
+    )
 
 
 class VemmioEntity(CoordinatorEntity[VemmioDataUpdateCoordinator]):
     """Defines a base Vemmio entity."""
 
+    # Safety-relevant entities receive websocket frames without coalescing
+    _priority_updates = False
+
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
         self._capability = capability
-        self._coordinator = coordinator
-        coordinator.device.register_status_update_callback(
-            self._capability.get_uuid_with_id(), self._handle_status_update
+        self._attr_unique_id = capability.unique_id
+        self._last_published: tuple[Any, ...] | None = None
+
+        if (entities_names is not None) and (capability.key in entities_names):
+            self._attr_name = entities_names[capability.key]
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to websocket status updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.websocket.async_add_listener(
+                self._capability.key,
+                self._handle_status_update,
+                priority=self._priority_updates,
+            )
         )
-        coordinator.device.enable_websocket()
-
-        if (entities_names is not None) and (
-            capability.get_uuid_with_id() in entities_names
-        ):
-            self._attr_name = entities_names[capability.get_uuid_with_id()]
+        if self.coordinator.data is not None:
+            self._async_update_from_device()
+        # Home Assistant writes this state once the entity has been added
+        self._last_published = self._published_state()
 
     @property
     def should_poll(self) -> bool:
@@ -109,38 +102,80 @@ class VemmioEntity(CoordinatorEntity[VemmioDataUpdateCoordinator]):
         return False
 
     @property
-    def device_info(self):
-        """Return device information about this entity."""
+    def available(self) -> bool:
+        """Return True once the device model has been fetched.
+
+        The entity is unavailable while its capability is missing from the
+        device, before it is removed.
+        """
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self._capability.key not in self.coordinator.missing_capabilities
+        )
 
-        # Last 3 bytes of mac address
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this entity."""
+        return self.coordinator.device_info
 
-        LOGGER.debug("[VemmioEntity] Getting device info")
-        LOGGER.debug(str(self.coordinator))
-        LOGGER.debug(str(self.coordinator.data))
+    @callback
+    def _handle_status_update(self) -> None:
+        """Handle a status update from the websocket."""
+        LOGGER.debug(
+            "[VemmioEntity] %s: Handling status update.",
+            self._capability.key,
+        )
 
-        deviceModel: DeviceModel = self.coordinator.data.model
+        self._async_handle_update()
 
-        macId = deviceModel.info.mac.replace(":", "")[-6:]
-        device_name = f"VEMMIO-{deviceModel.info.type}-{macId}".upper()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle availability changes from the coordinator.
 
-        LOGGER.debug("Device name: %s", device_name)
+        State changes found by a refresh are dispatched per capability
+        through the websocket manager.
+        """
+        if self._last_published is None or self.available != self._last_published[0]:
+            self._async_handle_update()
 
-        return DeviceInfo(
-            connections={(CONNECTION_NETWORK_MAC, deviceModel.info.mac)},
-            identifiers={(DOMAIN, deviceModel.info.mac)},
-            name=device_name,
-            manufacturer="Vemmio",
-            model=deviceModel.info.type,
-            sw_version=deviceModel.info.fw,
-            hw_version=deviceModel.info.revision,
-            configuration_url=f"http://{self.coordinator.vemmio.host}",
-        )
+    @callback
+    def _async_handle_update(self) -> None:
+        """Refresh cached attributes and write the state if it changed."""
+        if self.coordinator.data is not None:
+            self._async_update_from_device()
+        self._async_write_ha_state_if_changed()
 
     @callback
-    def _handle_status_update(self) -> None:
-        """Handle a status update from the websocket."""
-        LOGGER.debug(
-            f"[VemmioEntity] {self._capability.get_uuid_with_id()}:  Handling status update."
+    def _async_update_from_device(self) -> None:
+        """Update cached entity attributes from the device model."""
+
+    @property
+    def _status(self) -> Any:
+        """Return the status of this entity's capability."""
+        return self.coordinator.capability_status(self._capability)
+
+    def _published_state(self) -> tuple[Any, ...]:
+        """Return the values that make up the state written to Home Assistant."""
+        if not (available := self.available):
+            return (available,)
+
+        attributes = self.extra_state_attributes
+        return (
+            available,
+            self.state,
+            self.unit_of_measurement,
+            dict(attributes) if attributes else None,
         )
 
+    @callback
+    def _async_write_ha_state_if_changed(self) -> None:
+        """Write the state only when the value or its attributes changed."""
+        published = self._published_state()
+        if published == self._last_published:
+            self.coordinator.stats.state_writes_suppressed += 1
+            return
+
+        self._last_published = published
+        self.coordinator.stats.state_writes_emitted += 1
         self.async_write_ha_state()
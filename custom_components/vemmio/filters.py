@@ -0,0 +1,143 @@
+"""Publish filters for Vemmio sensor streams."""
+
+from __future__ import annotations
+
+
+class SensorPublishFilter:
+    """Decide whether a new sensor reading is worth publishing.
+
+    A reading is dropped while the minimum publish interval has not elapsed
+    since the last published reading, or while it stays within the absolute
+    or relative deadband around that reading.
+    """
+
+    __slots__ = (
+        "deadband",
+        "deadband_percent",
+        "min_interval",
+        "_published_at",
+        "_value",
+    )
+
+    def __init__(
+        self,
+        min_interval: float = 0.0,
+        deadband: float = 0.0,
+        deadband_percent: float = 0.0,
+    ) -> None:
+        """Initialize."""
+        self.min_interval = min_interval
+        self.deadband = deadband
+        self.deadband_percent = deadband_percent
+        self._published_at: float | None = None
+        self._value: float | None = None
+
+    @property
+    def next_publish(self) -> float:
+        """Return the monotonic time from which a new reading may be published."""
+        if self._published_at is None:
+            return 0.0
+        return self._published_at + self.min_interval
+
+    def accept(self, value: float | None, now: float) -> bool:
+        """Return True and remember the reading if it should be published."""
+        if value is None or self._value is None:
+            if value == self._value:
+                return False
+            return self._publish(value, now)
+
+        if now < self.next_publish:
+            return False
+
+        change = abs(value - self._value)
+        if self.deadband and change <= self.deadband:
+            return False
+        if (
+            self.deadband_percent
+            and change <= abs(self._value) * self.deadband_percent / 100
+        ):
+            return False
+        if not change:
+            return False
+        return self._publish(value, now)
+
+    def _publish(self, value: float | None, now: float) -> bool:
+        """Record a published reading."""
+        self._value = value
+        self._published_at = now
+        return True
+
+
+class SensorAggregator:
+    """Summarise sensor readings over consecutive windows.
+
+    Readings arrive only when the value changes, so each reading is weighted
+    by how long it held: a brief spike does not outweigh a steady value. The
+    last reading carries over into the next window.
+    """
+
+    __slots__ = (
+        "_held",
+        "_max",
+        "_min",
+        "_samples",
+        "_since",
+        "_value",
+        "_weighted",
+    )
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._value: float | None = None
+        self._since: float | None = None
+        self._held = 0.0
+        self._weighted = 0.0
+        self._min: float | None = None
+        self._max: float | None = None
+        self._samples = 0
+
+    def add(self, value: float | None, now: float) -> None:
+        """Add a reading that holds from now on."""
+        self._accumulate(now)
+        self._value = value
+        if value is not None:
+            self._samples += 1
+            self._track(value)
+
+    def flush(self, now: float) -> tuple[float, float, float, int] | None:
+        """Return mean, minimum, maximum and count and start a new window.
+
+        The mean is weighted by the time each reading held during the window.
+        Returns None when no value was known during the window.
+        """
+        self._accumulate(now)
+        summary: tuple[float, float, float, int] | None = None
+        if self._held > 0:
+            mean = self._weighted / self._held
+        else:
+            mean = self._value
+        if mean is not None and self._min is not None and self._max is not None:
+            summary = (mean, self._min, self._max, self._samples)
+
+        self._held = 0.0
+        self._weighted = 0.0
+        self._samples = 0
+        self._min = self._max = None
+        if self._value is not None:
+            self._track(self._value)
+        return summary
+
+    def _accumulate(self, now: float) -> None:
+        """Add the time the current value held since the last update."""
+        if self._value is not None and self._since is not None:
+            elapsed = now - self._since
+            self._held += elapsed
+            self._weighted += self._value * elapsed
+        self._since = now
+
+    def _track(self, value: float) -> None:
+        """Extend the minimum and maximum of the window."""
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
@@ -0,0 +1,59 @@
+"""Data models for the Vemmio integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from vemmio import Capability
+
+from .const import UNIQUE_ID_PREFIXES
+
+# Key of the coordinator status table: node UUID, capability id and type
+type StatusKey = tuple[str, int, str]
+
+
+@dataclass(frozen=True, slots=True)
+class VemmioCapability:
+    """Capability of a Vemmio device, detached from the client device model."""
+
+    type: str
+    node_uuid: str
+    id: int
+    key: str
+
+    @classmethod
+    def from_capability(
+        cls, capability_type: str, capability: Capability
+    ) -> VemmioCapability:
+        """Create from a capability of the vemmio client."""
+        return cls(
+            type=capability_type,
+            node_uuid=capability.node_uuid,
+            id=capability.id,
+            key=capability.get_uuid_with_id(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> VemmioCapability:
+        """Create from a stored snapshot."""
+        return cls(
+            type=data["type"],
+            node_uuid=data["node_uuid"],
+            id=data["id"],
+            key=data["key"],
+        )
+
+    @property
+    def unique_id(self) -> str:
+        """Return the unique ID of the entity of this capability."""
+        return f"{UNIQUE_ID_PREFIXES[self.type]}_{self.key}"
+
+    @property
+    def status_key(self) -> StatusKey:
+        """Return the key of this capability in the status table."""
+        return (self.node_uuid, self.id, self.type)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a representation suitable for storage."""
+        return asdict(self)
@@ -0,0 +1,92 @@
+"""Domain-wide refresh scheduler for Vemmio devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, REFRESH_MAX_CONCURRENCY
+from .stats import VemmioSchedulerStats
+
+if TYPE_CHECKING:
+    from .coordinator import VemmioDataUpdateCoordinator
+
+
+# Successive devices are offset by the golden ratio of the polling interval,
+# which spreads any number of devices evenly without knowing their count
+PHASE_STEP = (5**0.5 - 1) / 2
+
+
+class VemmioRefreshScheduler:
+    """Stagger Vemmio device refreshes and limit how many run at the same time."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._semaphore = asyncio.Semaphore(REFRESH_MAX_CONCURRENCY)
+        self._phases: dict[VemmioDataUpdateCoordinator, float] = {}
+        self._registrations = 0
+        self.stats = VemmioSchedulerStats()
+
+    @property
+    def coordinators(self) -> set[VemmioDataUpdateCoordinator]:
+        """Return the coordinators sharing this scheduler."""
+        return set(self._phases)
+
+    @callback
+    def async_add(self, coordinator: VemmioDataUpdateCoordinator) -> None:
+        """Add a coordinator and assign it a phase within the polling interval."""
+        self._phases[coordinator] = (self._registrations * PHASE_STEP) % 1
+        self._registrations += 1
+        self.stats.devices = len(self._phases)
+
+    @callback
+    def async_remove(self, coordinator: VemmioDataUpdateCoordinator) -> None:
+        """Remove a coordinator."""
+        self._phases.pop(coordinator, None)
+        self.stats.devices = len(self._phases)
+
+    def refresh_offset(
+        self, coordinator: VemmioDataUpdateCoordinator, interval: timedelta
+    ) -> timedelta:
+        """Return when, within the interval, the coordinator should refresh."""
+        return interval * self._phases.get(coordinator, 0.0)
+
+    @asynccontextmanager
+    async def async_refresh_slot(self) -> AsyncIterator[None]:
+        """Wait for a free refresh slot and hold it for the duration of a refresh."""
+        queued = time.monotonic()
+        async with self._semaphore:
+            started = time.monotonic()
+            self.stats.record_wait(started - queued)
+            self.stats.in_flight += 1
+            try:
+                yield
+            finally:
+                self.stats.in_flight -= 1
+                self.stats.record_refresh(time.monotonic() - started)
+
+
+@callback
+def async_register_coordinator(
+    hass: HomeAssistant, coordinator: VemmioDataUpdateCoordinator
+) -> tuple[VemmioRefreshScheduler, CALLBACK_TYPE]:
+    """Attach a coordinator to the shared scheduler of the Vemmio domain."""
+    scheduler: VemmioRefreshScheduler | None = hass.data.get(DOMAIN)
+    if scheduler is None:
+        scheduler = hass.data[DOMAIN] = VemmioRefreshScheduler()
+    scheduler.async_add(coordinator)
+
+    @callback
+    def unregister() -> None:
+        """Detach the coordinator and drop the scheduler once it is unused."""
+        scheduler.async_remove(coordinator)
+        if not scheduler.coordinators and hass.data.get(DOMAIN) is scheduler:
+            del hass.data[DOMAIN]
+
+    return scheduler, unregister
@@ -2,17 +2,48 @@
 
 from __future__ import annotations
 
-from vemmio import Capability
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
+from typing import Final
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    LIGHT_LUX,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import VemmioConfigEntry
-from .const import LOGGER
+from .const import (
+    CONF_ILLUMINATION_AGGREGATION_WINDOW,
+    CONF_ILLUMINATION_DEADBAND,
+    CONF_ILLUMINATION_DEADBAND_PERCENT,
+    CONF_ILLUMINATION_MIN_INTERVAL,
+    CONF_TEMPERATURE_AGGREGATION_WINDOW,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND_PERCENT,
+    CONF_TEMPERATURE_MIN_INTERVAL,
+    LOGGER,
+    STATS_UPDATE_INTERVAL,
+)
 from .coordinator import VemmioDataUpdateCoordinator
-from .entity import VemmioEntity, async_setup_attribute_entities_by_capability
+from .entity import VemmioEntity, async_setup_entities
+from .filters import SensorAggregator, SensorPublishFilter
+from .models import VemmioCapability
+from .stats import VemmioStats
 
 
 async def async_setup_entry(
@@ -21,40 +52,247 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up Vemmio sensors based on a config entry."""
-    coordinator = entry.runtime_data
     LOGGER.debug("Setting up Vemmio sensors for host %s", entry.data["host"])
-    LOGGER.debug("Entities names data: %s", str(entry.data["entities_names"]))
-
-    async_setup_attribute_entities_by_capability(
-        hass,
-        entry,
-        async_add_entities,
-        coordinator,
-        VemmioTemperatureSensor,
-        "temperature",
-    )
-    async_setup_attribute_entities_by_capability(
-        hass,
-        entry,
-        async_add_entities,
-        coordinator,
-        VemmioIlluminationSensor,
-        "illumination",
+    LOGGER.debug("Entities names data: %s", entry.data["entities_names"])
+
+    async_setup_entities(entry, async_add_entities, SENSOR_TYPES)
+    async_add_entities(
+        VemmioDiagnosticSensor(entry.runtime_data, description)
+        for description in DIAGNOSTIC_SENSORS
     )
 
 
-class VemmioTemperatureSensor(VemmioEntity, SensorEntity):
+@dataclass(frozen=True, kw_only=True)
+class VemmioDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Vemmio diagnostic sensor."""
+
+    value_fn: Callable[[VemmioStats], float | None]
+
+
+DIAGNOSTIC_SENSORS: Final = (
+    VemmioDiagnosticSensorEntityDescription(
+        key="refresh_latency",
+        name="Refresh latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda stats: stats.refresh_latency.mean,
+    ),
+    VemmioDiagnosticSensorEntityDescription(
+        key="refresh_failures",
+        name="Refresh failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.refresh_failures,
+    ),
+    VemmioDiagnosticSensorEntityDescription(
+        key="websocket_reconnects",
+        name="Websocket reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.websocket_reconnects,
+    ),
+    VemmioDiagnosticSensorEntityDescription(
+        key="websocket_frame_rate",
+        name="Websocket frame rate",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda stats: stats.frame_rate,
+    ),
+    VemmioDiagnosticSensorEntityDescription(
+        key="commands_merged",
+        name="Merged relay commands",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.commands_merged,
+    ),
+    VemmioDiagnosticSensorEntityDescription(
+        key="command_latency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda stats: stats.command_latency_mean,
+    ),
+)
+
+
+class VemmioDiagnosticSensor(
+    CoordinatorEntity[VemmioDataUpdateCoordinator], SensorEntity
+):
+    """Defines a Vemmio sensor reporting integration runtime statistics.
+
+    Statistics change with websocket frames and commands as well, while the
+    coordinator only refreshes every reconcile interval in push mode, so the
+    state is also written every STATS_UPDATE_INTERVAL.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    entity_description: VemmioDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: VemmioDataUpdateCoordinator,
+        description: VemmioDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"diagnostic_{coordinator.config_entry.entry_id}_{description.key}"
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Update the statistic periodically."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_update_statistic, STATS_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_update_statistic(self, _now: datetime) -> None:
+        """Write the current value of the statistic."""
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Statistics are available even while the device is unreachable."""
+        return True
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this entity."""
+        return self.coordinator.device_info
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the statistic."""
+        return self.entity_description.value_fn(self.coordinator.stats)
+
+
+class VemmioFilteredSensor(VemmioEntity, SensorEntity):
+    """Defines a Vemmio sensor that filters its readings before publishing.
+
+    With an aggregation window configured, the first reading is published
+    right away; after that the time-weighted mean of each window is
+    published with its minimum and maximum.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _min_interval_option: str
+    _deadband_option: str
+    _deadband_percent_option: str
+    _aggregation_window_option: str
+
+    def __init__(
+        self,
+        coordinator: VemmioDataUpdateCoordinator,
+        capability: VemmioCapability,
+        entities_names: dict,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            coordinator=coordinator,
+            capability=capability,
+            entities_names=entities_names,
+        )
+        options = coordinator.config_entry.options
+        self._filter = SensorPublishFilter(
+            min_interval=options.get(self._min_interval_option, 0.0),
+            deadband=options.get(self._deadband_option, 0.0),
+            deadband_percent=options.get(self._deadband_percent_option, 0.0),
+        )
+        self._unsub_publish: CALLBACK_TYPE | None = None
+        self._aggregation_window = options.get(self._aggregation_window_option, 0.0)
+        self._aggregator = SensorAggregator() if self._aggregation_window else None
+
+    async def async_added_to_hass(self) -> None:
+        """Start publishing aggregated readings."""
+        await super().async_added_to_hass()
+        if self._aggregator is not None:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_publish_window,
+                    timedelta(seconds=self._aggregation_window),
+                )
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending delayed publish."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
+    @callback
+    def _async_update_from_device(self) -> None:
+        """Publish the current reading if it passes the filter."""
+        now = time.monotonic()
+        value = self._status
+        if self._aggregator is not None:
+            self._aggregator.add(value, now)
+            # Do not stay unknown until the first window closes
+            if self._attr_native_value is None:
+                self._attr_native_value = value
+            return
+        if self._filter.accept(value, now):
+            self._attr_native_value = value
+            return
+
+        # Publish a throttled reading once the minimum interval has elapsed
+        delay = self._filter.next_publish - now
+        if delay > 0 and self._unsub_publish is None and self.hass is not None:
+            self._unsub_publish = async_call_later(
+                self.hass, delay, self._async_publish_delayed
+            )
+
+    @callback
+    def _async_publish_delayed(self, _now: datetime) -> None:
+        """Re-evaluate a reading that was held back by the minimum interval."""
+        self._unsub_publish = None
+        self._async_handle_update()
+
+    @callback
+    def _async_publish_window(self, _now: datetime) -> None:
+        """Publish the summary of the readings of the elapsed window."""
+        if self._aggregator is None:
+            return
+        if (summary := self._aggregator.flush(time.monotonic())) is None:
+            return
+        mean, minimum, maximum, samples = summary
+        self._attr_native_value = mean
+        self._attr_extra_state_attributes = {
+            "min": minimum,
+            "max": maximum,
+            "samples": samples,
+        }
+        self._async_write_ha_state_if_changed()
+
+
+class VemmioTemperatureSensor(VemmioFilteredSensor):
     """Defines a Vemmio Temperature sensor."""
 
+    _min_interval_option = CONF_TEMPERATURE_MIN_INTERVAL
+    _deadband_option = CONF_TEMPERATURE_DEADBAND
+    _deadband_percent_option = CONF_TEMPERATURE_DEADBAND_PERCENT
+    _aggregation_window_option = CONF_TEMPERATURE_AGGREGATION_WINDOW
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_icon = "mdi:thermometer"
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
         LOGGER.debug("Initializing Vemmio temperature sensor")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -62,22 +300,12 @@ class VemmioTemperatureSensor(VemmioEntity, SensorEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"temperature_sensor_{capability.get_uuid_with_id()}"
-        self._coordinator = coordinator
-        self._capability = capability
-        self.update_measurement_unit()
-        self._attr_native_value = None
-        self._attr_icon = "mdi:thermometer"
-        self._attr_device_class = SensorDeviceClass.TEMPERATURE
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the temperature sensor."""
-        return self.coordinator.data.get_temperature_status_value()
+        if coordinator.data is not None:
+            self.update_measurement_unit()
 
     async def refresh_task(self):
         """Refresh state of the temperature sensor."""
-        await self._coordinator.data.get_status()
+        await self.coordinator.async_get_status()
         self.update_measurement_unit()
 
     def update_measurement_unit(self):
@@ -89,21 +317,25 @@ class VemmioTemperatureSensor(VemmioEntity, SensorEntity):
             self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
 
-class VemmioIlluminationSensor(VemmioEntity, SensorEntity):
+class VemmioIlluminationSensor(VemmioFilteredSensor):
     """Defines a Vemmio Temperature sensor."""
 
-    _capability: Capability
-    _coordinator: VemmioDataUpdateCoordinator
+    _min_interval_option = CONF_ILLUMINATION_MIN_INTERVAL
+    _deadband_option = CONF_ILLUMINATION_DEADBAND
+    _deadband_percent_option = CONF_ILLUMINATION_DEADBAND_PERCENT
+    _aggregation_window_option = CONF_ILLUMINATION_AGGREGATION_WINDOW
+    _attr_device_class = SensorDeviceClass.ILLUMINANCE
+    _attr_icon = "mdi:brightness-5"
+    _attr_native_unit_of_measurement = LIGHT_LUX
 
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
         LOGGER.debug("Initializing Vemmio illumination sensor")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -111,25 +343,13 @@ class VemmioIlluminationSensor(VemmioEntity, SensorEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"illumination_sensor_{capability.get_uuid_with_id()}"
-        self._coordinator = coordinator
-        # self.update_measurement_unit()
-        self._attr_native_value = None
-        self._attr_icon = "mdi:brightness-5"
-        self._attr_device_class = SensorDeviceClass.ILLUMINANCE
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the temperature sensor."""
-        return self.coordinator.data.get_illumination_status_value()
 
     async def refresh_task(self):
-        """Refresh state of the temperature sensor."""
-        await self._coordinator.data.get_status()
-        self.update_measurement_unit()
+        """Refresh state of the illumination sensor."""
+        await self.coordinator.async_get_status()
 
-    def update_measurement_unit(self):
-        """Update the measurement unit based on device-reported units."""
-        self._attr_native_unit_of_measurement = (
-            self.coordinator.data.get_illumination_status_units()
-        )
+
+SENSOR_TYPES: Final = {
+    "temperature": VemmioTemperatureSensor,
+    "illumination": VemmioIlluminationSensor,
+}
@@ -0,0 +1,155 @@
+"""Runtime statistics for the Vemmio integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+import time
+from typing import Any
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Sliding window, in seconds, over which the websocket frame rate is reported
+FRAME_RATE_WINDOW = 60
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in seconds."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of recorded samples."""
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the recorded samples."""
+        if not (count := self.count):
+            return None
+        return self.total / count
+
+    def record(self, value: float) -> None:
+        """Record a sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram keyed by bucket upper bound."""
+        buckets = [f"<={bound}" for bound in LATENCY_BUCKETS]
+        buckets.append(f">{LATENCY_BUCKETS[-1]}")
+        return {
+            "buckets": dict(zip(buckets, self.counts, strict=True)),
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+        }
+
+
+@dataclass(slots=True)
+class VemmioStats:
+    """Counters collected for a single Vemmio config entry."""
+
+    started: float = field(default_factory=time.monotonic)
+    state_writes_emitted: int = 0
+    state_writes_suppressed: int = 0
+    commands_confirmed: int = 0
+    commands_failed: int = 0
+    commands_merged: int = 0
+    command_latency_total: float = 0.0
+    command_latency_max: float = 0.0
+    refresh_failures: int = 0
+    refresh_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    event_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    priority_event_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    websocket_frames: int = 0
+    # Frame counts per whole second of the frame rate window
+    recent_frames: deque[list[int]] = field(
+        default_factory=lambda: deque(maxlen=FRAME_RATE_WINDOW)
+    )
+    websocket_reconnects: int = 0
+    dispatches: int = 0
+    dispatch_time_total: float = 0.0
+    dispatch_time_max: float = 0.0
+
+    @property
+    def command_latency_mean(self) -> float | None:
+        """Return the mean time from command to device confirmation."""
+        if not self.commands_confirmed:
+            return None
+        return self.command_latency_total / self.commands_confirmed
+
+    @property
+    def frame_rate(self) -> float:
+        """Return websocket frames per second over the frame rate window."""
+        now = time.monotonic()
+        window = min(FRAME_RATE_WINDOW, now - self.started)
+        if window <= 0:
+            return 0.0
+        frames = sum(
+            count
+            for second, count in self.recent_frames
+            if second > now - FRAME_RATE_WINDOW
+        )
+        return frames / window
+
+    def record_frame(self) -> None:
+        """Record a websocket frame that changed a capability."""
+        self.websocket_frames += 1
+        second = int(time.monotonic())
+        if self.recent_frames and self.recent_frames[-1][0] == second:
+            self.recent_frames[-1][1] += 1
+        else:
+            self.recent_frames.append([second, 1])
+
+    def record_command_latency(self, latency: float) -> None:
+        """Record the time a command took to be confirmed by the device."""
+        self.commands_confirmed += 1
+        self.command_latency_total += latency
+        self.command_latency_max = max(self.command_latency_max, latency)
+
+    def record_dispatch(self, duration: float) -> None:
+        """Record the time spent notifying entities of a burst of updates."""
+        self.dispatches += 1
+        self.dispatch_time_total += duration
+        self.dispatch_time_max = max(self.dispatch_time_max, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        data = asdict(self)
+        del data["started"]
+        del data["recent_frames"]
+        data["refresh_latency"] = self.refresh_latency.as_dict()
+        data["event_latency"] = self.event_latency.as_dict()
+        data["priority_event_latency"] = self.priority_event_latency.as_dict()
+        data["command_latency_mean"] = self.command_latency_mean
+        data["frame_rate"] = self.frame_rate
+        return data
+
+
+@dataclass(slots=True)
+class VemmioSchedulerStats:
+    """Counters collected by the domain-wide refresh scheduler."""
+
+    devices: int = 0
+    refreshes: int = 0
+    in_flight: int = 0
+    refresh_time_total: float = 0.0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        """Record the time a refresh waited for a free slot."""
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def record_refresh(self, duration: float) -> None:
+        """Record a completed refresh."""
+        self.refreshes += 1
+        self.refresh_time_total += duration
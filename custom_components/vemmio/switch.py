@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import time
+from typing import Any, Final
 
-from vemmio import Capability
+from vemmio import VemmioError
 
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import VemmioConfigEntry
-from .const import LOGGER
+from .const import LOGGER, SWITCH_CONFIRM_TIMEOUT
 from .coordinator import VemmioDataUpdateCoordinator
-from .entity import VemmioEntity, async_setup_attribute_entities_switches
+from .entity import VemmioEntity, async_setup_entities
+from .models import VemmioCapability
 
 
 async def async_setup_entry(
@@ -22,12 +26,9 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up Vemmio switches based on a config entry."""
-    coordinator = entry.runtime_data
     LOGGER.debug("Setting up Vemmio switch for host %s", entry.data["host"])
 
-    async_setup_attribute_entities_switches(
-        hass, entry, async_add_entities, coordinator, VemmioSwitch
-    )
+    async_setup_entities(entry, async_add_entities, SWITCH_TYPES)
 
 
 class VemmioSwitch(VemmioEntity, SwitchEntity):
@@ -36,12 +37,11 @@ class VemmioSwitch(VemmioEntity, SwitchEntity):
     def __init__(
         self,
         coordinator: VemmioDataUpdateCoordinator,
-        capability: Capability,
+        capability: VemmioCapability,
         entities_names: dict,
     ) -> None:
         """Initialize."""
         LOGGER.debug("Initializing Vemmio switch")
-        LOGGER.debug(str(coordinator.data))
         LOGGER.debug("Host: %s", coordinator.vemmio.host)
 
         super().__init__(
@@ -49,42 +49,125 @@ class VemmioSwitch(VemmioEntity, SwitchEntity):
             capability=capability,
             entities_names=entities_names,
         )
-        self._attr_unique_id = f"switch_{capability.get_uuid_with_id()}"
-        self._capability = capability
-        self._coordinator = coordinator
+        self._pending_state: bool | None = None
+        self._pending_since = 0.0
+        self._pending_confirmed: asyncio.Event | None = None
 
     async def refresh_task(self):
         """Refresh state of the switch."""
-        await self._coordinator.data.get_status()
+        await self.coordinator.async_get_status()
 
     @property
     def is_on(self) -> bool:
         """Return true if the switch is on."""
-        LOGGER.debug(
-            f"[VemmioSwitch] Checking if switch is on. my ID is {self._capability.get_uuid_with_id()}"
-        )
+        if self._pending_state is not None:
+            return self._pending_state
+        return self._relay_state()
 
-        is_on = self.coordinator.data.get_relay_state(
-            self._capability.node_uuid, self._capability.id
-        )
-
-        LOGGER.debug(f"[VemmioSwitch] Switch is_on: {is_on}")
-        return is_on
+    def _relay_state(self) -> bool:
+        """Return the relay state reported by the device."""
+        return self._status
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         LOGGER.debug(
-            f"[VemmioSwitch] Switch on. my ID is {self._capability.get_uuid_with_id()}"
-        )
-        await self._coordinator.data.async_turn_on_switch_by_uuid_and_id(
-            self._capability.node_uuid, self._capability.id
+            "[VemmioSwitch] Switch on. my ID is %s",
+            self._capability.key,
         )
+        await self._async_set_state(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         LOGGER.debug(
-            f"[VemmioSwitch] Switch off. my ID is {self._capability.get_uuid_with_id()}"
+            "[VemmioSwitch] Switch off. my ID is %s",
+            self._capability.key,
         )
-        await self._coordinator.data.async_turn_off_switch_by_uuid_and_id(
-            self._capability.node_uuid, self._capability.id
+        await self._async_set_state(False)
+
+    async def _async_set_state(self, target: bool) -> None:
+        """Publish the target state and send it to the device.
+
+        Returns once the device accepted the command; the published state is
+        confirmed, or rolled back, in the background.
+        """
+        if self.coordinator.data is None:
+            raise HomeAssistantError(
+                f"Vemmio switch {self._capability.key} is not available yet"
+            )
+
+        if self._pending_confirmed is not None:
+            # A newer command supersedes the one still waiting
+            self._pending_confirmed.set()
+        confirmed = self._pending_confirmed = asyncio.Event()
+        self._pending_state = target
+        self._pending_since = time.monotonic()
+        self._async_write_ha_state_if_changed()
+
+        try:
+            await self.coordinator.commands.async_set_relay(
+                self._capability.node_uuid, self._capability.id, target
+            )
+        except VemmioError as error:
+            if self._pending_confirmed is confirmed:
+                self._async_roll_back()
+            raise HomeAssistantError(
+                f"Vemmio switch {self._capability.key} did not "
+                f"accept state {'on' if target else 'off'}: {error!r}"
+            ) from error
+
+        # The client may already reflect the new state after the command
+        self.coordinator.async_patch_capability(self._capability.key)
+        self._async_update_from_device()
+        if not confirmed.is_set():
+            self.coordinator.config_entry.async_create_background_task(
+                self.hass,
+                self._async_await_confirmation(confirmed, target),
+                f"vemmio switch confirmation {self._capability.key}",
+            )
+
+    async def _async_await_confirmation(
+        self, confirmed: asyncio.Event, target: bool
+    ) -> None:
+        """Roll back the published state if the device does not confirm it."""
+        try:
+            async with asyncio.timeout(SWITCH_CONFIRM_TIMEOUT.total_seconds()):
+                await confirmed.wait()
+        except TimeoutError:
+            if self._pending_confirmed is not confirmed:
+                return
+            LOGGER.warning(
+                "Vemmio switch %s did not confirm state %s within %s",
+                self._capability.key,
+                "on" if target else "off",
+                SWITCH_CONFIRM_TIMEOUT,
+            )
+            self._async_roll_back()
+
+    @callback
+    def _async_roll_back(self) -> None:
+        """Drop the unconfirmed state and publish the device state again."""
+        self._pending_state = None
+        self._pending_confirmed = None
+        self.coordinator.stats.commands_failed += 1
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_update_from_device(self) -> None:
+        """Confirm a pending command once the device reports its target state."""
+        if self._pending_state is None or self._relay_state() != self._pending_state:
+            return
+
+        latency = time.monotonic() - self._pending_since
+        LOGGER.debug(
+            "[VemmioSwitch] %s confirmed in %.3f s",
+            self._capability.key,
+            latency,
         )
+        self.coordinator.stats.record_command_latency(latency)
+        self._pending_state = None
+        if self._pending_confirmed is not None:
+            self._pending_confirmed.set()
+            self._pending_confirmed = None
+
+
+SWITCH_TYPES: Final = {"switch": VemmioSwitch}
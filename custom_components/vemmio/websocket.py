@@ -0,0 +1,170 @@
+"""Websocket connection manager for Vemmio."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from functools import partial
+import time
+from typing import TYPE_CHECKING
+
+from vemmio import Device as VemmioDevice
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import VemmioDataUpdateCoordinator
+
+
+class VemmioWebsocketManager:
+    """Own the websocket of a Vemmio device and route its frames to entities."""
+
+    def __init__(self, coordinator: VemmioDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._device: VemmioDevice | None = None
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._priority: set[str] = set()
+        self._pending: dict[str, float] = {}
+        self._flush_handle: asyncio.Handle | None = None
+
+    @property
+    def attached(self) -> bool:
+        """Return whether a websocket has been opened."""
+        return self._device is not None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the client reports the websocket as connected."""
+        return self._device is not None and self._device.is_websocket_connected()
+
+    @callback
+    def async_attach(self, device: VemmioDevice) -> bool:
+        """Register the capability index with a device and open its websocket.
+
+        The websocket stays open on the device it was opened on until it is
+        detached. Returns whether a websocket was opened.
+        """
+        if self._device is not None:
+            return False
+
+        LOGGER.debug(
+            "[websocket.py] Attaching %d capabilities to websocket of host %s",
+            len(self._listeners),
+            self._coordinator.vemmio.host,
+        )
+        self._device = device
+        for key in self._listeners:
+            device.register_status_update_callback(
+                key, partial(self._async_frame, device, key)
+            )
+        device.enable_websocket()
+        return True
+
+    @callback
+    def async_detach(self) -> None:
+        """Close the websocket and ignore frames of its device from now on."""
+        if (device := self._device) is None:
+            return
+
+        self._device = None
+        device.disable_websocket()
+
+    @callback
+    def async_reconnect(self) -> None:
+        """Close the websocket and re-open it on the latest device model."""
+        if (device := self._coordinator.data or self._device) is None:
+            return
+
+        self._coordinator.stats.websocket_reconnects += 1
+        self.async_detach()
+        self.async_attach(device)
+
+    @callback
+    def async_add_listener(
+        self, key: str, update_callback: CALLBACK_TYPE, *, priority: bool = False
+    ) -> CALLBACK_TYPE:
+        """Listen for status updates of a single capability.
+
+        Frames for priority capabilities skip burst coalescing and reach
+        their listeners while the frame is being handled.
+        """
+        listeners = self._listeners.setdefault(key, [])
+        if not listeners and self._device is not None:
+            self._device.register_status_update_callback(
+                key, partial(self._async_frame, self._device, key)
+            )
+        listeners.append(update_callback)
+        if priority:
+            self._priority.add(key)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the status update listener."""
+            listeners.remove(update_callback)
+            if priority and not listeners:
+                self._priority.discard(key)
+
+        return remove_listener
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Close the websocket and drop pending updates and listeners."""
+        self.async_detach()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+        self._listeners.clear()
+        self._priority.clear()
+
+    @callback
+    def _async_frame(self, device: VemmioDevice, key: str) -> None:
+        """Handle a websocket frame for a capability.
+
+        Only capabilities whose value the frame changed are dispatched.
+        """
+        if device is not self._device:
+            # Late frame of a websocket that has been detached
+            return
+        received = time.monotonic()
+        if not self._coordinator.async_websocket_frame(key, device):
+            return
+        if key not in self._priority:
+            self.async_dispatch((key,), received)
+            return
+
+        for update_callback in self._listeners.get(key, ()):
+            update_callback()
+        self._coordinator.stats.priority_event_latency.record(
+            time.monotonic() - received
+        )
+
+    @callback
+    def async_dispatch(
+        self, keys: Iterable[str], received: float | None = None
+    ) -> None:
+        """Queue capabilities for dispatch on the next event loop iteration."""
+        if received is None:
+            received = time.monotonic()
+        for key in keys:
+            self._pending.setdefault(key, received)
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = self._coordinator.hass.loop.call_soon(
+                self._async_flush
+            )
+
+    @callback
+    def _async_flush(self) -> None:
+        """Notify each changed capability once per burst."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        stats = self._coordinator.stats
+        started = time.monotonic()
+        for key, received in pending.items():
+            for update_callback in self._listeners.get(key, ()):
+                update_callback()
+            stats.event_latency.record(time.monotonic() - received)
+        stats.record_dispatch(time.monotonic() - started)
@@ -0,0 +1,35 @@
+"""Benchmarks for the Vemmio integration against a simulated device."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.vemmio.const import DOMAIN, UNIQUE_ID_PREFIXES
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from tests.simulator import SimulatedCapability, SimulatedHub
+
+type SetupHub = Callable[[SimulatedHub], Awaitable[MockConfigEntry]]
+
+PLATFORMS = {
+    "switch": "switch",
+    "openClose": "binary_sensor",
+    "motionDetector": "binary_sensor",
+    "floodDetector": "binary_sensor",
+    "temperature": "sensor",
+    "illumination": "sensor",
+}
+
+
+def entity_id_of(hass: HomeAssistant, capability: SimulatedCapability) -> str:
+    """Return the entity id of the entity of a simulated capability."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        PLATFORMS[capability.type],
+        DOMAIN,
+        f"{UNIQUE_ID_PREFIXES[capability.type]}_{capability.get_uuid_with_id()}",
+    )
+    assert entity_id is not None
+    return entity_id
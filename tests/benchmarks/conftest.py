@@ -0,0 +1,62 @@
+"""Fixtures for Vemmio benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.vemmio.const import CONF_ENTITIES_NAMES, DOMAIN
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from tests.simulator import SimulatedDevice, SimulatedHub
+
+from . import SetupHub
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the Vemmio custom integration."""
+
+
+@pytest.fixture(autouse=True)
+def clear_status_update_callbacks() -> None:
+    """Drop callbacks of earlier benchmarks from the shared callback dict."""
+    SimulatedDevice.clear_status_update_callbacks()
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow the debounced snapshot save to outlive a benchmark."""
+    return True
+
+
+@pytest.fixture
+async def setup_hub(hass: HomeAssistant) -> AsyncGenerator[SetupHub]:
+    """Return a function setting up a config entry for a simulated hub."""
+    entries: list[MockConfigEntry] = []
+
+    async def _setup(hub: SimulatedHub) -> MockConfigEntry:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_HOST: f"192.0.2.{len(entries) + 1}",
+                CONF_ENTITIES_NAMES: hub.entities_names(),
+            },
+            unique_id=hub.info.mac,
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        with patch("custom_components.vemmio.coordinator.Vemmio", hub.client):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+        return entry
+
+    yield _setup
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,187 @@
+"""Benchmarks of the Vemmio integration against a simulated device.
+
+Results are printed in the "Vemmio benchmarks" section of the test summary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import time
+
+import pytest
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import Event, HomeAssistant, callback
+
+from tests.simulator import SimulatedHub
+
+from . import SetupHub, entity_id_of
+
+pytestmark = pytest.mark.benchmark
+
+FRAMES = 5000
+BURST_FRAMES = 10
+COMMANDS = 50
+COMMAND_LATENCY = 0.005
+
+type Report = Callable[[str, float, str], None]
+
+
+def _count_state_writes(hass: HomeAssistant, entity_id: str) -> list[Event]:
+    """Collect the state changed events of an entity from now on."""
+    events: list[Event] = []
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        if event.data["entity_id"] == entity_id:
+            events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+    return events
+
+
+@pytest.mark.parametrize("capabilities", [12, 120, 600])
+async def test_setup_time(
+    hass: HomeAssistant,
+    setup_hub: SetupHub,
+    benchmark_report: Report,
+    capabilities: int,
+) -> None:
+    """Measure the setup time of a device with a number of capabilities."""
+    hub = SimulatedHub.with_capabilities(capabilities)
+    relay = hub.of_type("switch")[0]
+    hub.set_status(relay, state=True)
+
+    started = time.perf_counter()
+    await setup_hub(hub)
+    elapsed = time.perf_counter() - started
+
+    for capability in hub.capabilities:
+        assert hass.states.get(entity_id_of(hass, capability)) is not None
+    # Values come from the status request of the first refresh
+    assert hub.status_requests == 1
+    assert hass.states.get(entity_id_of(hass, relay)).state == STATE_ON
+    benchmark_report(f"setup, {capabilities} capabilities", elapsed * 1000, "ms")
+    benchmark_report(
+        f"setup per capability, {capabilities} capabilities",
+        elapsed / capabilities * 1000,
+        "ms",
+    )
+
+
+async def test_frame_throughput(
+    hass: HomeAssistant, setup_hub: SetupHub, benchmark_report: Report
+) -> None:
+    """Measure how many websocket frames per second reach Home Assistant."""
+    hub = SimulatedHub.with_capabilities(60)
+    entry = await setup_hub(hub)
+    inputs = hub.of_type("openClose")
+
+    started = time.perf_counter()
+    for frame in range(FRAMES):
+        round_, index = divmod(frame, len(inputs))
+        hub.push(inputs[index], state=round_ % 2 == 0)
+        if index == len(inputs) - 1:
+            # One round of frames per event loop iteration
+            await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - started
+
+    assert entry.runtime_data.stats.websocket_frames == FRAMES
+    last_round = (FRAMES - 1) // len(inputs)
+    expected = STATE_ON if last_round % 2 == 0 else STATE_OFF
+    assert hass.states.get(entity_id_of(hass, inputs[-1])).state == expected
+    benchmark_report("websocket frames", FRAMES / elapsed, "frames/s")
+
+
+async def test_state_writes_per_frame(
+    hass: HomeAssistant, setup_hub: SetupHub, benchmark_report: Report
+) -> None:
+    """Count the state writes caused by changed, repeated and bursty frames."""
+    hub = SimulatedHub.with_capabilities(12)
+    await setup_hub(hub)
+    contact = hub.of_type("openClose")[0]
+    entity_id = entity_id_of(hass, contact)
+    events = _count_state_writes(hass, entity_id)
+
+    # Frames that change the state, one per event loop iteration
+    for frame in range(FRAMES // 10):
+        hub.push(contact, state=frame % 2 == 0)
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    changed = len(events) / (FRAMES // 10)
+
+    # Frames that repeat the current state
+    events.clear()
+    for _ in range(FRAMES // 10):
+        hub.push(contact, state=False)
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    repeated = len(events) / (FRAMES // 10)
+
+    # Bursts of frames within a single event loop iteration
+    events.clear()
+    bursts = FRAMES // 10 // BURST_FRAMES
+    for burst in range(bursts):
+        for frame in range(BURST_FRAMES):
+            hub.push(contact, state=(burst + frame) % 2 == 0)
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    bursty = len(events) / (bursts * BURST_FRAMES)
+
+    assert changed == 1
+    assert repeated == 0
+    assert bursty <= 1 / BURST_FRAMES
+    assert hass.states.get(entity_id).state in (STATE_ON, STATE_OFF)
+    benchmark_report("state writes per changed frame", changed, "writes")
+    benchmark_report("state writes per repeated frame", repeated, "writes")
+    benchmark_report(
+        f"state writes per frame in bursts of {BURST_FRAMES}", bursty, "writes"
+    )
+
+
+async def test_relay_command_latency(
+    hass: HomeAssistant, setup_hub: SetupHub, benchmark_report: Report
+) -> None:
+    """Measure how long a switch service call takes and how long to confirm."""
+    hub = SimulatedHub.with_capabilities(60, command_latency=COMMAND_LATENCY)
+    entry = await setup_hub(hub)
+    stats = entry.runtime_data.stats
+    entity_ids = [entity_id_of(hass, relay) for relay in hub.of_type("switch")]
+
+    latencies: list[float] = []
+    for command in range(COMMANDS):
+        entity_id = entity_ids[command % len(entity_ids)]
+        service = "turn_on" if command // len(entity_ids) % 2 == 0 else "turn_off"
+        started = time.perf_counter()
+        await hass.services.async_call(
+            "switch", service, {"entity_id": entity_id}, blocking=True
+        )
+        latencies.append(time.perf_counter() - started)
+        await hass.async_block_till_done()
+    latencies.sort()
+
+    assert hub.commands == COMMANDS
+    assert stats.commands_confirmed == COMMANDS
+    assert stats.commands_failed == 0
+    benchmark_report(
+        "relay command service call, mean",
+        sum(latencies) / COMMANDS * 1000,
+        "ms",
+    )
+    benchmark_report(
+        "relay command service call, p95",
+        latencies[int(COMMANDS * 0.95) - 1] * 1000,
+        "ms",
+    )
+    benchmark_report(
+        "relay command confirmation, mean",
+        stats.command_latency_mean * 1000,
+        "ms",
+    )
+    benchmark_report(
+        "relay command overhead over device latency, mean",
+        (sum(latencies) / COMMANDS - COMMAND_LATENCY) * 1000,
+        "ms",
+    )
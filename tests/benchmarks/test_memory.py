@@ -0,0 +1,121 @@
+"""Memory benchmarks of the Vemmio integration against a simulated device.
+
+Results are printed in the "Vemmio benchmarks" section of the test summary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Generator
+import gc
+import tracemalloc
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from tests.simulator import SimulatedHub
+
+from . import SetupHub
+
+pytestmark = pytest.mark.benchmark
+
+FRAMES = 1000
+MAX_INTEGRATION_BYTES_PER_ENTITY = 32 * 1024
+
+INTEGRATION_FILTER = tracemalloc.Filter(True, "*/custom_components/vemmio/*")
+
+type Report = Callable[[str, float, str], None]
+
+
+@pytest.fixture
+def traced_memory() -> Generator[None]:
+    """Trace memory allocations during the test."""
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+def _allocated(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> tuple[int, int]:
+    """Return the bytes allocated in total and by the integration."""
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    integration = sum(
+        stat.size_diff
+        for stat in after.filter_traces([INTEGRATION_FILTER]).compare_to(
+            before.filter_traces([INTEGRATION_FILTER]), "filename"
+        )
+    )
+    return total, integration
+
+
+@pytest.mark.usefixtures("traced_memory")
+@pytest.mark.parametrize("capabilities", [60, 600])
+async def test_memory_per_entity(
+    hass: HomeAssistant,
+    setup_hub: SetupHub,
+    benchmark_report: Report,
+    capabilities: int,
+) -> None:
+    """Measure the memory and GC tracked objects each entity keeps alive."""
+    hub = SimulatedHub.with_capabilities(capabilities)
+
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    before = tracemalloc.take_snapshot()
+    await setup_hub(hub)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    objects = len(gc.get_objects()) - objects_before
+
+    total, integration = _allocated(before, after)
+    assert integration / capabilities < MAX_INTEGRATION_BYTES_PER_ENTITY
+    benchmark_report(
+        f"memory per entity, {capabilities} entities", total / capabilities, "bytes"
+    )
+    benchmark_report(
+        f"integration memory per entity, {capabilities} entities",
+        integration / capabilities,
+        "bytes",
+    )
+    benchmark_report(
+        f"GC tracked objects per entity, {capabilities} entities",
+        objects / capabilities,
+        "objects",
+    )
+
+
+@pytest.mark.usefixtures("traced_memory")
+async def test_frame_gc_pressure(
+    hass: HomeAssistant, setup_hub: SetupHub, benchmark_report: Report
+) -> None:
+    """Measure the garbage and collections caused by websocket frames."""
+    hub = SimulatedHub.with_capabilities(600)
+    await setup_hub(hub)
+    inputs = hub.of_type("openClose")
+
+    gc.collect()
+    collections_before = sum(stats["collections"] for stats in gc.get_stats())
+    tracemalloc.reset_peak()
+    current_before, _ = tracemalloc.get_traced_memory()
+    for frame in range(FRAMES):
+        round_, index = divmod(frame, len(inputs))
+        hub.push(inputs[index], state=round_ % 2 == 0)
+        if index == len(inputs) - 1:
+            await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    current, peak = tracemalloc.get_traced_memory()
+    collections = (
+        sum(stats["collections"] for stats in gc.get_stats()) - collections_before
+    )
+
+    benchmark_report(
+        "memory retained per frame", (current - current_before) / FRAMES, "bytes"
+    )
+    benchmark_report(
+        f"peak memory above baseline over {FRAMES} frames",
+        peak - current_before,
+        "bytes",
+    )
+    benchmark_report(f"GC collections per {FRAMES} frames", collections, "runs")
@@ -0,0 +1,38 @@
+"""Fixtures for Vemmio tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import importlib.util
+
+import pytest
+
+# The benchmarks set up the integration in Home Assistant, which needs the
+# packages in requirements_test.txt; the other tests are pure Python.
+collect_ignore = (
+    []
+    if importlib.util.find_spec("pytest_homeassistant_custom_component")
+    and importlib.util.find_spec("vemmio")
+    else ["benchmarks"]
+)
+
+_BENCHMARK_RESULTS: list[tuple[str, float, str]] = []
+
+
+@pytest.fixture
+def benchmark_report() -> Callable[[str, float, str], None]:
+    """Return a function recording a benchmark result for the test summary."""
+
+    def _report(name: str, value: float, unit: str) -> None:
+        _BENCHMARK_RESULTS.append((name, value, unit))
+
+    return _report
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Print the recorded benchmark results."""
+    if not _BENCHMARK_RESULTS:
+        return
+    terminalreporter.section("Vemmio benchmarks")
+    for name, value, unit in _BENCHMARK_RESULTS:
+        terminalreporter.write_line(f"{name:<56} {value:>12.3f} {unit}")
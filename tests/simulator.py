@@ -0,0 +1,322 @@
+"""In-process simulator of Vemmio devices at the client boundary.
+
+SimulatedHub holds the state of a device. SimulatedVemmio stands in for the
+vemmio 0.1.1 client and mirrors how it behaves:
+
+- update() fetches the device info only and returns the same Device on
+  every call; the capabilities of that Device are built once.
+- Relay, input and sensor values live in a private status model that only
+  get_status() and websocket frames update.
+- Status update callbacks are kept in a dict shared by all devices, and
+  every frame calls all of them, whichever capability or device it is for.
+
+Relay commands are confirmed by a frame sent after the command returned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import copy
+from types import SimpleNamespace
+from typing import Any, ClassVar
+
+CAPABILITY_TYPES = (
+    "switch",
+    "openClose",
+    "motionDetector",
+    "floodDetector",
+    "temperature",
+    "illumination",
+)
+
+# Capability types a device has at most one sensor of
+SENSOR_TYPES = ("motionDetector", "floodDetector", "temperature", "illumination")
+
+# Status of a capability when it is added to a node
+INITIAL_STATUS: dict[str, dict[str, Any]] = {
+    "switch": {"state": False},
+    "openClose": {"state": False},
+    "motionDetector": {"state": False},
+    "floodDetector": {"state": False},
+    "temperature": {"value": 21.0, "units": "C"},
+    "illumination": {"value": 100.0, "units": "lx"},
+}
+
+# Relays and inputs per simulated node
+NODE_SIZE = 8
+
+
+class SimulatedCapability:
+    """Capability of a simulated device, like vemmio.Capability."""
+
+    def __init__(self, capability_type: str, node_uuid: str, capability_id: int):
+        """Initialize."""
+        self.type = capability_type
+        self.node_uuid = node_uuid
+        self.id = capability_id
+
+    def get_uuid_with_id(self) -> str:
+        """Return the key of the capability."""
+        return f"{self.node_uuid}_{self.id}"
+
+    def get_name(self) -> str:
+        """Return the default name of the capability."""
+        return f"{self.type} {self.get_uuid_with_id()}"
+
+
+class SimulatedHub:
+    """State of a simulated Vemmio device, as kept by the device itself."""
+
+    def __init__(
+        self,
+        *,
+        mac: str = "00:11:22:33:44:55",
+        device_type: str = "hub",
+        fw: str = "1.0.0",
+        revision: str = "1",
+        command_latency: float = 0.0,
+    ) -> None:
+        """Initialize."""
+        self.info = {"mac": mac, "type": device_type, "fw": fw, "revision": revision}
+        self.command_latency = command_latency
+        self.capabilities: list[SimulatedCapability] = []
+        self.status: dict[str, dict[str, dict[int, dict[str, Any]]]] = {}
+        self.websockets: list[SimulatedDevice] = []
+        self.updates = 0
+        self.status_requests = 0
+        self.commands = 0
+        self.frames = 0
+
+    @classmethod
+    def with_capabilities(cls, count: int, **kwargs: Any) -> SimulatedHub:
+        """Create a hub with count capabilities.
+
+        The first node carries one sensor of each kind, as a device has at
+        most one of each; the other capabilities are relays and inputs,
+        NODE_SIZE to a node.
+        """
+        hub = cls(**kwargs)
+        for capability_type in SENSOR_TYPES[:count]:
+            hub.add_capability(capability_type, "node0")
+        for index in range(max(count - len(SENSOR_TYPES), 0)):
+            capability_type = ("switch", "openClose")[index % 2]
+            hub.add_capability(capability_type, f"node{index // NODE_SIZE + 1}")
+        return hub
+
+    def add_capability(
+        self, capability_type: str, node_uuid: str
+    ) -> SimulatedCapability:
+        """Add a capability to a node, with the next free id of that node."""
+        node = self.status.setdefault(node_uuid, {})
+        capability_id = sum(len(capabilities) for capabilities in node.values())
+        node.setdefault(capability_type, {})[capability_id] = dict(
+            INITIAL_STATUS[capability_type]
+        )
+        capability = SimulatedCapability(capability_type, node_uuid, capability_id)
+        self.capabilities.append(capability)
+        return capability
+
+    def of_type(self, capability_type: str) -> list[SimulatedCapability]:
+        """Return the capabilities of a type."""
+        return [
+            capability
+            for capability in self.capabilities
+            if capability.type == capability_type
+        ]
+
+    def entities_names(self) -> dict[str, str]:
+        """Return entity names as stored by the config flow."""
+        return {
+            capability.get_uuid_with_id(): capability.get_name()
+            for capability in self.capabilities
+        }
+
+    def client(self, host: str, session: Any = None) -> SimulatedVemmio:
+        """Return a client for this hub; a drop-in for vemmio.Vemmio."""
+        return SimulatedVemmio(self, host)
+
+    def set_status(self, capability: SimulatedCapability, **status: Any) -> None:
+        """Change the state of a capability without sending a frame."""
+        self.status[capability.node_uuid][capability.type][capability.id].update(
+            status
+        )
+
+    def push(self, capability: SimulatedCapability, **status: Any) -> None:
+        """Change the state of a capability and send a websocket frame."""
+        self.set_status(capability, **status)
+        self.frames += 1
+        status = self.status[capability.node_uuid][capability.type][capability.id]
+        for device in list(self.websockets):
+            device.receive_frame(capability, status)
+
+    def drop_websockets(self) -> None:
+        """Disconnect every open websocket, as if the device rebooted."""
+        for device in self.websockets:
+            device.connected = False
+        self.websockets.clear()
+
+    async def async_command(
+        self, node_uuid: str, capability_id: int, state: bool
+    ) -> None:
+        """Switch a relay and confirm it with a frame after responding."""
+        await asyncio.sleep(self.command_latency)
+        self.commands += 1
+        capability = next(
+            capability
+            for capability in self.of_type("switch")
+            if (capability.node_uuid, capability.id) == (node_uuid, capability_id)
+        )
+        self.set_status(capability, state=state)
+        asyncio.get_running_loop().call_soon(self.push, capability)
+
+
+class SimulatedDevice:
+    """Device model of a simulated hub, like vemmio.Device."""
+
+    # Shared by all devices, like Device._status_update_callbacks
+    _status_update_callbacks: ClassVar[dict[str, Callable[[], None]]] = {}
+
+    def __init__(self, hub: SimulatedHub) -> None:
+        """Initialize."""
+        self._hub = hub
+        self.model = SimpleNamespace(info=SimpleNamespace(**hub.info))
+        self.capabilities = list(hub.capabilities)
+        self._status_model: dict[str, dict[str, dict[int, dict[str, Any]]]] = {}
+        self.connected = False
+
+    @classmethod
+    def clear_status_update_callbacks(cls) -> None:
+        """Forget the callbacks registered by all devices."""
+        cls._status_update_callbacks.clear()
+
+    def update_from_dict(self, info: dict[str, str]) -> None:
+        """Update the device info."""
+        for name, value in info.items():
+            setattr(self.model.info, name, value)
+
+    def get_capabilities(self, capability_type: str) -> list[SimulatedCapability]:
+        """Return the capabilities of a type."""
+        return [
+            capability
+            for capability in self.capabilities
+            if capability.type == capability_type
+        ]
+
+    def _capability_status(
+        self,
+        capability_type: str,
+        node_uuid: str | None = None,
+        capability_id: int | None = None,
+    ) -> dict[str, Any]:
+        """Return the known status of a capability, or of the device's sensor."""
+        for node, capabilities in self._status_model.items():
+            if node_uuid is not None and node != node_uuid:
+                continue
+            for status_id, status in capabilities.get(capability_type, {}).items():
+                if capability_id is None or status_id == capability_id:
+                    return status
+        return {}
+
+    def get_relay_state(self, node_uuid: str, capability_id: int) -> bool | None:
+        """Return the state of a relay."""
+        return self._capability_status("switch", node_uuid, capability_id).get(
+            "state"
+        )
+
+    def get_input_state(self, node_uuid: str, capability_id: int) -> bool | None:
+        """Return the state of an input."""
+        return self._capability_status("openClose", node_uuid, capability_id).get(
+            "state"
+        )
+
+    def get_motion_status_state(self) -> bool | None:
+        """Return the state of the motion detector."""
+        return self._capability_status("motionDetector").get("state")
+
+    def get_flood_status_state(self) -> bool | None:
+        """Return the state of the flood detector."""
+        return self._capability_status("floodDetector").get("state")
+
+    def get_temperature_status_value(self) -> float | None:
+        """Return the value of the temperature sensor."""
+        return self._capability_status("temperature").get("value")
+
+    def get_temperature_status_units(self) -> str | None:
+        """Return the units of the temperature sensor."""
+        return self._capability_status("temperature").get("units")
+
+    def get_illumination_status_value(self) -> float | None:
+        """Return the value of the illumination sensor."""
+        return self._capability_status("illumination").get("value")
+
+    def get_illumination_status_units(self) -> str | None:
+        """Return the units of the illumination sensor."""
+        return self._capability_status("illumination").get("units")
+
+    async def get_status(self) -> None:
+        """Fetch the status of the device into the status model."""
+        self._hub.status_requests += 1
+        self._status_model = copy.deepcopy(self._hub.status)
+
+    def register_status_update_callback(
+        self, key: str, update_callback: Callable[[], None]
+    ) -> None:
+        """Register a callback, shared with all devices, under a key."""
+        self._status_update_callbacks[key] = update_callback
+
+    def enable_websocket(self) -> None:
+        """Open the websocket."""
+        self.connected = True
+        self._hub.websockets.append(self)
+
+    def disable_websocket(self) -> None:
+        """Close the websocket."""
+        self.connected = False
+        if self in self._hub.websockets:
+            self._hub.websockets.remove(self)
+
+    def is_websocket_connected(self) -> bool:
+        """Return whether the websocket is connected."""
+        return self.connected
+
+    def receive_frame(
+        self, capability: SimulatedCapability, status: dict[str, Any]
+    ) -> None:
+        """Apply a websocket frame to the status model and call all callbacks."""
+        self._status_model.setdefault(capability.node_uuid, {}).setdefault(
+            capability.type, {}
+        )[capability.id] = dict(status)
+        for update_callback in list(self._status_update_callbacks.values()):
+            update_callback()
+
+    async def async_turn_on_switch_by_uuid_and_id(
+        self, node_uuid: str, capability_id: int
+    ) -> None:
+        """Turn a relay on."""
+        await self._hub.async_command(node_uuid, capability_id, True)
+
+    async def async_turn_off_switch_by_uuid_and_id(
+        self, node_uuid: str, capability_id: int
+    ) -> None:
+        """Turn a relay off."""
+        await self._hub.async_command(node_uuid, capability_id, False)
+
+
+class SimulatedVemmio:
+    """Client of a simulated hub, like vemmio.Vemmio."""
+
+    def __init__(self, hub: SimulatedHub, host: str) -> None:
+        """Initialize."""
+        self._hub = hub
+        self.host = host
+        self._device: SimulatedDevice | None = None
+
+    async def update(self) -> SimulatedDevice:
+        """Fetch the device info and return the device."""
+        self._hub.updates += 1
+        if self._device is None:
+            self._device = SimulatedDevice(self._hub)
+        else:
+            self._device.update_from_dict(self._hub.info)
+        return self._device
@@ -0,0 +1,161 @@
+"""Tests for the Vemmio sensor publish filters and aggregator."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import random
+
+import pytest
+
+# The filters are pure Python; load them by path because importing the
+# integration package requires Home Assistant and the vemmio client.
+_SPEC = importlib.util.spec_from_file_location(
+    "vemmio_filters",
+    Path(__file__).parents[1] / "custom_components" / "vemmio" / "filters.py",
+)
+filters = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(filters)
+SensorAggregator = filters.SensorAggregator
+SensorPublishFilter = filters.SensorPublishFilter
+
+
+def _stream(
+    publish_filter: SensorPublishFilter, readings: list[tuple[float, float]]
+) -> list[tuple[float, float]]:
+    """Feed timed readings through a filter and return the published ones."""
+    return [
+        (now, value) for now, value in readings if publish_filter.accept(value, now)
+    ]
+
+
+def test_unfiltered_publishes_every_change() -> None:
+    """Without options every changed reading is published."""
+    publish_filter = SensorPublishFilter()
+
+    assert _stream(
+        publish_filter, [(0.0, 20.0), (0.1, 20.0), (0.2, 20.5), (0.3, 20.0)]
+    ) == [(0.0, 20.0), (0.2, 20.5), (0.3, 20.0)]
+
+
+def test_none_readings() -> None:
+    """Unknown readings are published once, like any other change."""
+    publish_filter = SensorPublishFilter(min_interval=60.0, deadband=1.0)
+
+    assert publish_filter.accept(None, 0.0) is False
+    assert publish_filter.accept(20.0, 1.0) is True
+    assert publish_filter.accept(None, 2.0) is True
+    assert publish_filter.accept(None, 3.0) is False
+    assert publish_filter.accept(20.1, 4.0) is True
+
+
+def test_min_interval() -> None:
+    """Readings are held back until the minimum interval has elapsed."""
+    publish_filter = SensorPublishFilter(min_interval=10.0)
+
+    assert publish_filter.accept(20.0, 0.0) is True
+    assert publish_filter.accept(21.0, 5.0) is False
+    assert publish_filter.accept(22.0, 9.9) is False
+    assert publish_filter.accept(22.0, 10.0) is True
+    assert publish_filter.next_publish == 20.0
+
+
+def test_absolute_deadband() -> None:
+    """Changes within the absolute deadband are dropped."""
+    publish_filter = SensorPublishFilter(deadband=0.5)
+
+    assert _stream(
+        publish_filter,
+        [(0.0, 20.0), (1.0, 20.3), (2.0, 19.5), (3.0, 20.6), (4.0, 20.2)],
+    ) == [(0.0, 20.0), (3.0, 20.6)]
+
+
+def test_percent_deadband() -> None:
+    """Changes within the relative deadband of the last value are dropped."""
+    publish_filter = SensorPublishFilter(deadband_percent=10.0)
+
+    assert _stream(
+        publish_filter,
+        [(0.0, 100.0), (1.0, 109.0), (2.0, 91.0), (3.0, 111.0), (4.0, 120.0)],
+    ) == [(0.0, 100.0), (3.0, 111.0)]
+
+
+def test_delayed_trailing_publish() -> None:
+    """A held-back reading is published when re-evaluated at next_publish.
+
+    The sensor schedules this re-evaluation so the last reading of a burst
+    is not lost.
+    """
+    publish_filter = SensorPublishFilter(min_interval=10.0)
+
+    assert publish_filter.accept(20.0, 0.0) is True
+    assert publish_filter.accept(23.0, 2.0) is False
+    assert publish_filter.next_publish == 10.0
+    assert publish_filter.accept(23.0, publish_filter.next_publish) is True
+    # Once published, the trailing reading is not published again
+    assert publish_filter.accept(23.0, 30.0) is False
+
+
+@pytest.mark.parametrize(("rate", "min_interval"), [(10.0, 1.0), (100.0, 5.0)])
+def test_high_rate_stream(rate: float, min_interval: float) -> None:
+    """A noisy high-rate stream is reduced to the configured publish rate."""
+    rng = random.Random(1)
+    duration = 60.0
+    readings = [
+        (step / rate, 20.0 + rng.uniform(-0.05, 0.05) + step / (rate * duration))
+        for step in range(int(duration * rate))
+    ]
+    publish_filter = SensorPublishFilter(min_interval=min_interval, deadband=0.1)
+
+    published = _stream(publish_filter, readings)
+
+    assert 1 < len(published) <= duration / min_interval + 1
+    for (previous_at, previous), (now, value) in zip(
+        published, published[1:], strict=False
+    ):
+        assert now - previous_at >= min_interval
+        assert abs(value - previous) > 0.1
+
+
+def test_aggregator_time_weighted_mean() -> None:
+    """Readings are weighted by how long they held, not by their count."""
+    aggregator = SensorAggregator()
+
+    aggregator.add(20.0, 0.0)
+    aggregator.add(30.0, 59.0)
+    aggregator.add(20.0, 60.0)
+
+    mean, minimum, maximum, samples = aggregator.flush(120.0)
+    assert mean == pytest.approx((20.0 * 119 + 30.0) / 120)
+    assert (minimum, maximum, samples) == (20.0, 30.0, 3)
+
+
+def test_aggregator_carries_value_over() -> None:
+    """A window without readings summarises the value that kept holding."""
+    aggregator = SensorAggregator()
+    assert aggregator.flush(60.0) is None
+
+    aggregator.add(20.0, 30.0)
+    assert aggregator.flush(60.0) == (20.0, 20.0, 20.0, 1)
+    assert aggregator.flush(120.0) == (20.0, 20.0, 20.0, 0)
+
+    aggregator.add(22.0, 150.0)
+    mean, minimum, maximum, samples = aggregator.flush(180.0)
+    assert mean == pytest.approx(21.0)
+    assert (minimum, maximum, samples) == (20.0, 22.0, 1)
+
+
+def test_aggregator_unknown_readings() -> None:
+    """Time without a known value does not count towards the mean."""
+    aggregator = SensorAggregator()
+
+    aggregator.add(20.0, 0.0)
+    aggregator.add(None, 10.0)
+    aggregator.add(26.0, 50.0)
+
+    mean, minimum, maximum, samples = aggregator.flush(60.0)
+    assert mean == pytest.approx(23.0)
+    assert (minimum, maximum, samples) == (20.0, 26.0, 2)
+
+    aggregator.add(None, 60.0)
+    assert aggregator.flush(120.0) is None